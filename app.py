@@ -1,66 +1,297 @@
 
-import requests
-import json
-from flask import Flask, render_template, request, redirect, url_for, flash
+import os
+import contextvars
+import logging
+import time
+from flask import Flask, current_app, g, has_request_context, render_template, request, redirect, url_for, flash, jsonify, make_response
 from flask_sqlalchemy import SQLAlchemy
+from weather.air import parse_air_quality
+from weather.cache import NegativeCache, cache_key, create_cache
+from weather.cassette import create_cassette
+from weather.ratelimit import PRIORITY_BACKGROUND, PRIORITY_DEFAULT, PRIORITY_INTERACTIVE, QuotaTimeout, create_scheduler
+from weather.settings import resolve_config
+from weather.store import ResponseStore
+from weather.tracing import tracer
+from weather.units import UNIT_SYSTEMS, convert_temperature, remember_units, resolve_units
 
-app = Flask(__name__)
-app.config['DEBUG'] = True
-app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///weather.db'
-app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
-app.config['SECRET_KEY'] = 'thisisasecret'
+logger = logging.getLogger('weather.app')
 
-db = SQLAlchemy(app)
+OPENWEATHER_URL = 'http://api.openweathermap.org/data/2.5/{endpoint}'
+OPENWEATHER_KEY = '271d1234d3f497eed5b1d80a07b3fcd1'
+
+_executor = None
+_executor_pid = None
+
+db = SQLAlchemy()
 
 class City(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(50), nullable=False)
 
-def get_weather_data(city):
-    url = f'http://api.openweathermap.org/data/2.5/weather?q={ city }&units=metric&appid=271d1234d3f497eed5b1d80a07b3fcd1'
-    r = requests.get(url).json()
-    with open('aqi_data.json','w',encoding='UTF-8') as f:
-        json.dump(r,f,indent=4) 
+def create_app(config=None):
+    """Build the app for a profile name ('development', 'production', 'testing') or config object"""
+    from weather.assets import init_assets
+    from weather.compression import init_compression
+    from weather.icons import init_icons
+    from weather.logs import configure_logging
+    from weather.profiling import init_profiling
+    from weather.tracing import init_tracing
+
+    app = Flask(__name__)
+    app.config.from_object(resolve_config(config))
+
+    configure_logging(app)
+    db.init_app(app)
+    app.extensions['weather_cache'] = create_cache(app.config, app.root_path)
+    app.extensions['upstream_scheduler'] = create_scheduler(app.config, app.root_path)
+    app.extensions['upstream_cassette'] = create_cassette(app.config, app.root_path)
+    app.extensions['negative_cache'] = NegativeCache(app.config['WEATHER_NEGATIVE_CACHE_SIZE'],
+                                                     app.config['WEATHER_NEGATIVE_CACHE_TTL'])
+    app.extensions['response_store'] = ResponseStore(
+        os.path.join(app.root_path, app.config['WEATHER_RESPONSE_DIR']))
+    init_assets(app)
+    init_compression(app)
+    init_icons(app)
+    init_profiling(app)
+    init_tracing(app, db)
+
+    app.register_error_handler(QuotaTimeout, quota_timeout)
+    app.add_url_rule('/', view_func=index_get)
+    app.add_url_rule('/', view_func=index_post, methods=['POST'])
+    app.add_url_rule('/api/forecast', view_func=forecast_get)
+    app.add_url_rule('/api/upstream', view_func=upstream_stats)
+    app.add_url_rule('/delete/<name>', view_func=delete_city)
+
+    return app
 
+def upstream_executor():
+    """Thread pool for concurrent upstream calls, recreated in each forked worker"""
+    global _executor, _executor_pid
+    if _executor is None or _executor_pid != os.getpid():
+        from concurrent.futures import ThreadPoolExecutor
 
+        _executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix='upstream')
+        _executor_pid = os.getpid()
+    return _executor
+
+def quota_wait_budget():
+    """Seconds the caller may still wait for a token; one budget per request, not per call"""
+    max_wait = current_app.config['WEATHER_QUOTA_MAX_WAIT']
+    if not has_request_context():
+        return max_wait
+    deadline = g.setdefault('quota_deadline', time.monotonic() + max_wait)
+    return max(0.0, deadline - time.monotonic())
+
+def request_upstream(endpoint, params, priority=PRIORITY_DEFAULT):
+    import requests
+
+    upstream_scheduler = current_app.extensions['upstream_scheduler']
+    cassette = current_app.extensions['upstream_cassette']
+    with tracer.span('upstream', endpoint=endpoint, **params) as span:
+        if cassette is not None and cassette.mode == 'replay':
+            r = cassette.replay(endpoint, params)
+            span.set_attribute('replayed', True)
+            span.set_attribute('cod', r.get('cod'))
+            return r
+
+        span.set_attribute('quota_wait_ms', round(1000 * upstream_scheduler.acquire(
+            priority, timeout=quota_wait_budget()), 3))
+
+        # Always fetch SI units; temperatures are converted per request on output
+        query = dict(params, units='standard', appid=OPENWEATHER_KEY)
+        started = time.perf_counter()
+        r = requests.get(OPENWEATHER_URL.format(endpoint=endpoint), params=query,
+                         timeout=current_app.config['WEATHER_UPSTREAM_TIMEOUT']).json()
+        if cassette is not None:
+            cassette.record(endpoint, params, r, time.perf_counter() - started)
+        span.set_attribute('cod', r.get('cod'))
     return r
+
+def fetch_upstream(endpoint, city, priority=PRIORITY_DEFAULT, refresh=False, load=None):
+    key = cache_key(endpoint, city)
+    ttl = current_app.config['WEATHER_CACHE_TTL']
+    weather_cache = current_app.extensions['weather_cache']
+    response_store = current_app.extensions['response_store']
+    if not refresh:
+        cached = weather_cache.get(key)
+        if cached is not None:
+            return cached
+
+        stored = response_store.load(key)
+        if stored is not None:
+            payload, fetched_at = stored
+            remaining = fetched_at + ttl - time.time()
+            if remaining > 0:
+                weather_cache.set(key, payload, remaining)
+                return payload
+
+    if load is None:
+        r = request_upstream(endpoint, {'q': city}, priority)
+    else:
+        r = load()
+
+    # /weather reports cod as an int, /forecast as a string
+    if str(r.get('cod')) == '200':
+        weather_cache.set(key, r, ttl)
+        response_store.save(key, r)
+
+    return r
+
+def last_observation(city):
+    """Return the last successful observation of a city, even an expired one, or None"""
+    key = cache_key('weather', city)
+    entry = current_app.extensions['weather_cache'].peek(key)
+    if entry is None:
+        entry = current_app.extensions['response_store'].load(key)
+    if entry is None:
+        return None
+    return entry[0]
+
+def known_coordinates(city):
+    """Return the last known {'lat', 'lon'} of a city, even from an expired observation"""
+    observation = last_observation(city)
+    if observation is None:
+        return None
+    return observation.get('coord')
+
+def load_observation(city, priority=PRIORITY_DEFAULT):
+    """Fetch current weather and air quality for a city as one observation"""
+    coord = known_coordinates(city)
+    air_future = None
+    if coord:
+        # Coordinates are known, so air quality need not wait for the weather call
+        context = contextvars.copy_context()
+        air_future = upstream_executor().submit(
+            context.run, request_upstream, 'air_pollution',
+            {'lat': coord['lat'], 'lon': coord['lon']}, priority)
+
+    r = request_upstream('weather', {'q': city}, priority)
+    if r.get('cod') != 200:
+        return r
+
+    # Air quality is secondary: a failed call must not discard the weather payload
+    try:
+        if air_future is not None:
+            air = air_future.result()
+        else:
+            air = request_upstream('air_pollution', {'lat': r['coord']['lat'], 'lon': r['coord']['lon']}, priority)
+    except Exception:
+        logger.warning('air quality unavailable', extra={'city': city}, exc_info=True)
+        air = None
+    r['air_quality'] = parse_air_quality(air)
+    return r
+
+def get_weather_data(city, priority=PRIORITY_DEFAULT, refresh=False):
+    with tracer.span('get_weather_data', city=city):
+        return fetch_upstream('weather', city, priority=priority, refresh=refresh,
+                              load=lambda: load_observation(city, priority))
+
+def get_forecast_data(city, priority=PRIORITY_DEFAULT):
+    return fetch_upstream('forecast', city, priority=priority)
+
+def warm_start(app):
+    from weather.warmup import start_warmup
+
+    with app.app_context():
+        cities = [city.name for city in City.query.all()]
+
+    def refresh(name):
+        with app.app_context():
+            key = cache_key('weather', name)
+            stored = app.extensions['response_store'].load(key)
+            if stored is not None:
+                payload, fetched_at = stored
+                remaining = fetched_at + app.config['WEATHER_CACHE_TTL'] - time.time()
+                if remaining > 0:
+                    # Another process fetched it since this one booted; reuse that fetch
+                    app.extensions['weather_cache'].set(key, payload, remaining)
+                    return
+            get_weather_data(name, priority=PRIORITY_BACKGROUND, refresh=True)
+
+    return start_warmup(cities, app.extensions['weather_cache'], refresh,
+                        app.config['WEATHER_STALE_GRACE'],
+                        store=app.extensions['response_store'], ttl=app.config['WEATHER_CACHE_TTL'])
+
+def quota_timeout(error):
+    return 'Weather service is busy, please retry shortly.', 503, {'Retry-After': '30'}
     
 
-@app.route('/')
+def weather_card(name, r, units):
+    return {
+        'city' : name,
+        'temperature' : convert_temperature(r['main']['temp'], units),
+        'humidity': r['main']['humidity'],
+        'description' : r['weather'][0]['description'],
+        'icon' : r['weather'][0]['icon'],
+        'air_quality' : r.get('air_quality'),
+    }
+
 def index_get():
+    units = resolve_units(request)
     cities = City.query.all()
 
     weather_data = []
 
     for city in cities:
 
-        r = get_weather_data(city.name)
-        print(r)
+        try:
+            r = get_weather_data(city.name)
+        except QuotaTimeout:
+            # The request's quota budget is spent; later cities fail fast onto their stale data
+            r = {'cod': 429, 'message': 'quota wait exceeded'}
+        logger.debug('weather payload', extra={'city': city.name, 'payload': r, 'sampled': True})
+
+        if r.get('cod') != 200:
+            # Quota (429) or upstream errors: show the last observation, or leave the card out
+            logger.warning('weather unavailable', extra={'city': city.name, 'cod': r.get('cod')})
+            r = last_observation(city.name)
+            if r is None:
+                continue
 
-        weather = {
-            'city' : city.name,
-            'temperature' : r['main']['temp'],
-            'humidity': r['main']['humidity'],
-            'description' : r['weather'][0]['description'],
-            'icon' : r['weather'][0]['icon'],
-            
-        }
+        weather_data.append(weather_card(city.name, r, units))
 
-        weather_data.append(weather)
 
+    response = make_response(render_template('weather.html', weather_data=weather_data,
+                                             units=units, unit_systems=UNIT_SYSTEMS))
+    return remember_units(request, response, units)
 
-    return render_template('weather.html', weather_data=weather_data)
+def forecast_get():
+    from weather.forecast import daily_forecasts
+
+    units = resolve_units(request)
+    cities = City.query.all()
+
+    payloads = [get_forecast_data(city.name) for city in cities]
+    found = [(city, r) for city, r in zip(cities, payloads) if str(r.get('cod')) == '200']
+
+    daily = daily_forecasts([r for _, r in found])
+    for days in daily:
+        for day in days:
+            for field in ('temp_min', 'temp_max', 'temp_mean'):
+                day[field] = convert_temperature(day[field], units)
+
+    response = jsonify({city.name: days for (city, _), days in zip(found, daily)})
+    return remember_units(request, response, units)
+
+def upstream_stats():
+    stats = current_app.extensions['upstream_scheduler'].stats()
+    stats['negative_cache'] = current_app.extensions['negative_cache'].stats()
+    return jsonify(stats)
 
-@app.route('/', methods=['POST'])
 def index_post():
     err_msg = ''
     new_city = request.form.get('city')
         
     if new_city:
         existing_city = City.query.filter_by(name=new_city).first()
+        negative_cache = current_app.extensions['negative_cache']
 
-        if not existing_city:
-            new_city_data = get_weather_data(new_city)
+        if existing_city:
+            err_msg = 'City already exists in the database!'
+        elif new_city in negative_cache:
+            err_msg = 'City does not exist in the world!'
+        else:
+            new_city_data = get_weather_data(new_city, priority=PRIORITY_INTERACTIVE)
 
             if new_city_data['cod'] == 200:
                 new_city_obj = City(name=new_city)
@@ -69,9 +300,10 @@ def index_post():
                 
                 db.session.commit()
             else:
+                # Only a definite 'not found' is remembered, not quota or server errors
+                if str(new_city_data['cod']) == '404':
+                    negative_cache.add(new_city)
                 err_msg = 'City does not exist in the world!'
-        else:
-            err_msg = 'City already exists in the database!'
 
     if err_msg:
         flash(err_msg, 'error')
@@ -80,7 +312,6 @@ def index_post():
 
     return redirect(url_for('index_get'))
 
-@app.route('/delete/<name>')
 def delete_city(name):
     city = City.query.filter_by(name=name).first()
     db.session.delete(city)
@@ -89,5 +320,20 @@ def delete_city(name):
     flash(f'Successfully deleted { city.name }', 'success')
     return redirect(url_for('index_get'))
 
+def __getattr__(name):
+    # 'app' is built on first access so importing this module stays cheap
+    if name == 'app':
+        globals()['app'] = create_app()
+        return globals()['app']
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 if __name__=='__main__':
-    app.run(debug=True)
+    app = create_app()
+    # With the reloader on, this process only watches files; the serving child warms up
+    if not app.debug or os.environ.get('WERKZEUG_RUN_MAIN') == 'true':
+        try:
+            warm_start(app)
+        except Exception:
+            # e.g. no tables yet on a fresh checkout; serve with a cold cache
+            logger.exception('Cache warmup failed')
+    app.run(debug=app.config['DEBUG'])
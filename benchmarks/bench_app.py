@@ -0,0 +1,139 @@
+"""
+Benchmark cases for the weather app's hot paths
+"""
+import json
+import shutil
+import tempfile
+from unittest import mock
+
+import app as weather_app
+from weather.settings import TestingConfig
+
+CARD_COUNTS = (10, 100, 1000)
+CITY_COUNTS = (10, 100, 1000)
+DASHBOARD_CITIES = 20
+
+
+def sample_payload(name='Raipur'):
+    """A /weather payload shaped like the real upstream response"""
+    return {
+        'coord': {'lon': 81.6333, 'lat': 21.2333},
+        'weather': [{'id': 721, 'main': 'Haze', 'description': 'haze', 'icon': '50n'}],
+        'base': 'stations',
+        'main': {'temp': 298.23, 'feels_like': 298.83, 'temp_min': 298.23, 'temp_max': 298.23,
+                 'pressure': 1013, 'humidity': 78},
+        'visibility': 3000,
+        'wind': {'speed': 1.54, 'deg': 130},
+        'clouds': {'all': 0},
+        'dt': 1637686925,
+        'sys': {'type': 1, 'id': 9067, 'country': 'IN', 'sunrise': 1637627573, 'sunset': 1637667331},
+        'timezone': 19800,
+        'id': 1258980,
+        'name': name,
+        'cod': 200,
+        'air_quality': {'aqi': 2, 'label': 'Fair', 'components': {'pm2_5': 12.1}},
+    }
+
+
+class _StubResponse:
+    def __init__(self, payload):
+        self._payload = payload
+
+    def json(self):
+        return json.loads(json.dumps(self._payload))
+
+
+def stub_upstream(url, params=None, **kwargs):
+    """Stand-in for requests.get answering every OpenWeather endpoint"""
+    if url.endswith('/air_pollution'):
+        return _StubResponse({'list': [{'main': {'aqi': 2}, 'components': {'pm2_5': 12.1}}]})
+    return _StubResponse(sample_payload((params or {}).get('q', 'Raipur')))
+
+
+class BenchmarkApp:
+    """A testing-profile app with its own scratch directory and seeded cities"""
+
+    def __init__(self, cities):
+        self.tmpdir = tempfile.mkdtemp(prefix='weather-bench-')
+
+        class Config(TestingConfig):
+            WEATHER_RESPONSE_DIR = self.tmpdir
+            WEATHER_QUOTA_PER_MINUTE = 10 ** 9
+            WEATHER_QUOTA_BURST = 10 ** 9
+
+        self.app = weather_app.create_app(Config)
+        with self.app.app_context():
+            weather_app.db.create_all()
+            weather_app.db.session.add_all(weather_app.City(name=f'City{i}') for i in range(cities))
+            weather_app.db.session.commit()
+        self.client = self.app.test_client()
+
+    def clear_caches(self):
+        self.app.extensions['weather_cache'].clear()
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def close(self):
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+
+def micro_benchmarks():
+    """Yield (name, setup) pairs; setup returns (callable, teardown)"""
+    raw = json.dumps(sample_payload())
+    payload = sample_payload()
+
+    yield 'parse_payload', lambda: (lambda: json.loads(raw), None)
+    yield 'build_weather_card', lambda: (lambda: weather_app.weather_card('Raipur', payload, 'metric'), None)
+
+    for count in CARD_COUNTS:
+        def setup(count=count):
+            bench = BenchmarkApp(0)
+            cards = [weather_app.weather_card(f'City{i}', payload, 'metric') for i in range(count)]
+            from weather.units import UNIT_SYSTEMS
+
+            def render():
+                with bench.app.test_request_context('/'):
+                    weather_app.render_template('weather.html', weather_data=cards,
+                                                units='metric', unit_systems=UNIT_SYSTEMS)
+            return render, bench.close
+        yield f'render_weather_html[{count}]', setup
+
+    for count in CITY_COUNTS:
+        def setup(count=count):
+            bench = BenchmarkApp(count)
+
+            def query():
+                with bench.app.app_context():
+                    weather_app.City.query.all()
+            return query, bench.close
+        yield f'city_query_all[{count}]', setup
+
+
+def macro_benchmarks():
+    """Yield (name, setup) pairs for end-to-end requests against a stubbed upstream"""
+    def setup_warm():
+        bench = BenchmarkApp(DASHBOARD_CITIES)
+        patcher = mock.patch('requests.get', stub_upstream)
+        patcher.start()
+        bench.client.get('/')
+
+        def teardown():
+            patcher.stop()
+            bench.close()
+        return (lambda: bench.client.get('/')), teardown
+
+    def setup_cold():
+        bench = BenchmarkApp(DASHBOARD_CITIES)
+        patcher = mock.patch('requests.get', stub_upstream)
+        patcher.start()
+
+        def cold_request():
+            bench.clear_caches()
+            bench.client.get('/')
+
+        def teardown():
+            patcher.stop()
+            bench.close()
+        return cold_request, teardown
+
+    yield f'index_get_warm[{DASHBOARD_CITIES}]', setup_warm
+    yield f'index_get_cold[{DASHBOARD_CITIES}]', setup_cold
@@ -5,24 +5,49 @@ import os
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options as ChromeOptions
 from selenium.webdriver.firefox.options import Options as FirefoxOptions
-from webdriver_manager.chrome import ChromeDriverManager
-from webdriver_manager.firefox import GeckoDriverManager
 from selenium.webdriver.chrome.service import Service as ChromeService
 from selenium.webdriver.firefox.service import Service as FirefoxService
+from utils.driver_resolver import resolve_driver
 
 class Config:
     # Base URL
-    BASE_URL = "https://kalp.network/"
+    BASE_URL = os.getenv('BASE_URL', "https://kalp.network/")
+    # Directory of a site capture to serve locally and test instead of BASE_URL
+    MIRROR_DIR = os.getenv('MIRROR_DIR')
+    MIRROR_DEFAULT_DIR = "mirror"
     
     # Timeouts
     IMPLICIT_WAIT = 10
     EXPLICIT_WAIT = 20
     PAGE_LOAD_TIMEOUT = 30
+    # Limit for execute_async_script; the WebDriver default
+    SCRIPT_TIMEOUT = 30
+    # Upper bound for the event-driven settle waits in BasePage
+    SETTLE_TIMEOUT = 5
     
     # Browser settings
     BROWSER = os.getenv('BROWSER', 'chrome').lower()
     HEADLESS = os.getenv('HEADLESS', 'false').lower() == 'true'
     
+    # Driver pool settings: keep warm browser sessions between tests
+    REUSE_DRIVER = os.getenv('REUSE_DRIVER', 'true').lower() == 'true'
+    DRIVER_POOL_SIZE = int(os.getenv('DRIVER_POOL_SIZE', '1'))
+    
+    # Link checker settings: results are cached for the test session
+    LINK_CHECK_WORKERS = int(os.getenv('LINK_CHECK_WORKERS', '16'))
+    LINK_CHECK_PER_HOST = int(os.getenv('LINK_CHECK_PER_HOST', '4'))
+    LINK_CHECK_TIMEOUT = 10
+    
+    # Performance history: a run is compared with the previous PERF_BASELINE_WINDOW runs
+    PERF_HISTORY_DB = os.getenv('PERF_HISTORY_DB', os.path.join('reports', 'perf_history.db'))
+    PERF_BASELINE_WINDOW = 20
+    PERF_MIN_SAMPLES = 5
+    PERF_REGRESSION_Z = 3.5
+    PERF_MIN_CHANGE = 0.1
+    
+    # Resolved driver paths, keyed by browser version, shared by every run on this machine
+    DRIVER_CACHE = os.getenv('DRIVER_CACHE', os.path.join(os.path.expanduser('~'), '.cache', 'kalp-tests', 'drivers.json'))
+    
     # Screenshot settings
     SCREENSHOT_ON_FAILURE = True
     SCREENSHOT_DIR = "screenshots"
@@ -42,7 +67,7 @@ class Config:
             options.add_argument('--disable-gpu')
             options.add_argument('--window-size=1920,1080')
             
-            service = ChromeService(ChromeDriverManager().install())
+            service = ChromeService(resolve_driver('chrome', Config.DRIVER_CACHE))
             driver = webdriver.Chrome(service=service, options=options)
             
         elif Config.BROWSER == 'firefox':
@@ -50,7 +75,7 @@ class Config:
             if Config.HEADLESS:
                 options.add_argument('--headless')
             
-            service = FirefoxService(GeckoDriverManager().install())
+            service = FirefoxService(resolve_driver('firefox', Config.DRIVER_CACHE))
             driver = webdriver.Firefox(service=service, options=options)
         
         else:
@@ -58,6 +83,7 @@ class Config:
         
         driver.implicitly_wait(Config.IMPLICIT_WAIT)
         driver.set_page_load_timeout(Config.PAGE_LOAD_TIMEOUT)
+        driver.set_script_timeout(Config.SCRIPT_TIMEOUT)
         driver.maximize_window()
         
         return driver
\ No newline at end of file
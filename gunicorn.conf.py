@@ -0,0 +1,32 @@
+"""
+Gunicorn settings for the weather app
+
+    python -m weather.assets build
+    gunicorn -c gunicorn.conf.py 'app:create_app("production")'
+
+The app is preloaded in the master so forked workers share its memory pages. The production
+profile refuses to start without an up-to-date asset build, hence the build step first.
+"""
+import os
+
+bind = os.getenv('BIND', '0.0.0.0:8000')
+workers = int(os.getenv('WEB_CONCURRENCY', '4'))
+preload_app = True
+
+
+def post_fork(server, worker):
+    """Give each worker its own database connections and warm its cache
+
+    Every worker re-arms stale entries, but only the first to claim the sweep refreshes them.
+    """
+    from app import db, warm_start
+
+    app = worker.app.wsgi()
+    with app.app_context():
+        # Pooled connections inherited from the master must not be shared
+        db.engine.dispose(close=False)
+    try:
+        warm_start(app)
+    except Exception:
+        # A cold cache is slower, not fatal; let the worker boot
+        server.log.exception('Cache warmup failed in worker %s', worker.pid)
@@ -0,0 +1,60 @@
+"""
+Measure weather app startup time in fresh interpreters
+
+Usage:
+    python measure_startup.py [--runs N] [--profile development|production|testing]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+# Children import app and resolve relative paths from here, whatever the caller's cwd
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+CHILD = '''
+import json, time
+t0 = time.perf_counter()
+import app as weather_app
+t1 = time.perf_counter()
+application = weather_app.create_app({profile!r})
+t2 = time.perf_counter()
+with application.app_context():
+    weather_app.db.create_all()
+client = application.test_client()
+client.get('/api/upstream')
+t3 = time.perf_counter()
+print(json.dumps({{'import': t1 - t0, 'create_app': t2 - t1, 'first_request': t3 - t2}}))
+'''
+
+
+def measure(runs, profile):
+    """Return per-phase timings (seconds) of each run"""
+    results = []
+    for _ in range(runs):
+        output = subprocess.run([sys.executable, '-c', CHILD.format(profile=profile)],
+                                cwd=ROOT, capture_output=True, text=True, check=True).stdout
+        results.append(json.loads(output.strip().splitlines()[-1]))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--runs', type=int, default=10)
+    parser.add_argument('--profile', default='testing')
+    args = parser.parse_args()
+
+    results = measure(args.runs, args.profile)
+    print(f"Startup over {args.runs} runs ({args.profile} profile):")
+    for phase in ('import', 'create_app', 'first_request'):
+        values = [r[phase] * 1000 for r in results]
+        print(f"  {phase:<14} median {statistics.median(values):8.1f} ms   "
+              f"min {min(values):8.1f} ms   max {max(values):8.1f} ms")
+    total = [sum(r.values()) * 1000 for r in results]
+    print(f"  {'total':<14} median {statistics.median(total):8.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
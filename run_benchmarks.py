@@ -0,0 +1,120 @@
+"""
+Benchmark runner for the weather app
+
+Usage:
+    python run_benchmarks.py                      # run and save benchmarks/results/<timestamp>.json
+    python run_benchmarks.py --compare OLD.json   # also flag regressions against an earlier run
+    python run_benchmarks.py --filter render      # only cases whose name contains 'render'
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from datetime import datetime
+
+RESULTS_DIR = os.path.join('benchmarks', 'results')
+
+
+def time_case(func, min_time, max_rounds):
+    """Run func repeatedly and return per-call timing statistics in milliseconds"""
+    func()  # warm-up
+    samples = []
+    deadline = time.perf_counter() + min_time
+    while len(samples) < max_rounds and (len(samples) < 5 or time.perf_counter() < deadline):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return {
+        'rounds': len(samples),
+        'median_ms': statistics.median(samples),
+        'mean_ms': statistics.fmean(samples),
+        'min_ms': samples[0],
+        'p95_ms': samples[min(len(samples) - 1, int(len(samples) * 0.95))],
+        'stdev_ms': statistics.stdev(samples) if len(samples) > 1 else 0.0,
+    }
+
+
+def run(cases, min_time, max_rounds):
+    results = {}
+    for kind, name, setup in cases:
+        func, teardown = setup()
+        try:
+            stats = time_case(func, min_time, max_rounds)
+        finally:
+            if teardown:
+                teardown()
+        stats['kind'] = kind
+        results[name] = stats
+        print(f"  {name:<32} median {stats['median_ms']:9.3f} ms   p95 {stats['p95_ms']:9.3f} ms   "
+              f"({stats['rounds']} rounds)")
+    return results
+
+
+def compare(current, baseline, threshold):
+    """Return the cases whose median slowed down by more than threshold (a fraction)"""
+    regressions = []
+    for name, stats in current.items():
+        old = baseline.get(name)
+        if not old:
+            continue
+        ratio = stats['median_ms'] / old['median_ms'] if old['median_ms'] else float('inf')
+        # Ignore changes that are within the noise of the baseline run itself
+        noise = 2 * old.get('stdev_ms', 0.0)
+        if ratio > 1 + threshold and stats['median_ms'] - old['median_ms'] > noise:
+            regressions.append((name, old['median_ms'], stats['median_ms'], ratio))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Weather app benchmarks')
+    parser.add_argument('--filter', default='', help='only run cases whose name contains this')
+    parser.add_argument('--min-time', type=float, default=1.0, help='seconds to spend per case')
+    parser.add_argument('--max-rounds', type=int, default=1000)
+    parser.add_argument('--compare', help='earlier results JSON to compare against')
+    parser.add_argument('--threshold', type=float, default=0.10,
+                        help='slowdown fraction flagged as a regression (default 0.10)')
+    parser.add_argument('--output', help='results file (default benchmarks/results/<timestamp>.json)')
+    args = parser.parse_args()
+
+    from benchmarks.bench_app import macro_benchmarks, micro_benchmarks
+
+    cases = [('micro', name, setup) for name, setup in micro_benchmarks()]
+    cases += [('macro', name, setup) for name, setup in macro_benchmarks()]
+    cases = [case for case in cases if args.filter in case[1]]
+
+    print("Running weather app benchmarks...")
+    print("=" * 60)
+    results = run(cases, args.min_time, args.max_rounds)
+
+    output = args.output or os.path.join(
+        RESULTS_DIR, f"bench_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    os.makedirs(os.path.dirname(output) or '.', exist_ok=True)
+    with open(output, 'w', encoding='UTF-8') as f:
+        json.dump({
+            'created_at': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'results': results,
+        }, f, indent=4)
+    print("=" * 60)
+    print(f"Results saved: {output}")
+
+    if args.compare:
+        with open(args.compare, encoding='UTF-8') as f:
+            baseline = json.load(f)['results']
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"Regressions against {args.compare}:")
+            for name, old, new, ratio in regressions:
+                print(f"  {name:<32} {old:9.3f} ms -> {new:9.3f} ms  (x{ratio:.2f})")
+            return 1
+        print(f"No regressions against {args.compare}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
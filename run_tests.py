@@ -3,8 +3,16 @@ Test runner script for Kalp Network exploratory testing
 """
 import os
 import sys
+import html
+import json
+import argparse
 import subprocess
 from datetime import datetime
+from utils.perf_history import PerfHistory, trend_table_html
+
+# Per-test durations from earlier runs, used to balance parallel shards
+DURATIONS_FILE = os.path.join('reports', 'test_durations.json')
+DEFAULT_DURATION = 10.0
 
 def run_tests():
     """Run the test suite with proper configuration"""
@@ -32,9 +40,19 @@ def run_tests():
     print(f"Command: {' '.join(cmd)}")
     print("=" * 60)
     
+    # Record per-test durations so later parallel runs can balance their shards
+    results_json = f'reports/test_results_{timestamp}.json'
+    env = dict(os.environ, TEST_RESULTS_JSON=results_json, PERF_RUN_ID=timestamp)
+    
     try:
         # Run tests
-        result = subprocess.run(cmd, capture_output=False, text=True)
+        result = subprocess.run(cmd, capture_output=False, text=True, env=env)
+        
+        try:
+            with open(results_json) as f:
+                save_durations(load_durations(), json.load(f))
+        except (OSError, ValueError):
+            pass
         
         print("\n" + "=" * 60)
         print("Test execution completed!")
@@ -48,6 +66,162 @@ def run_tests():
         print(f"Error running tests: {e}")
         return 1
 
+def collect_tests():
+    """Return the node ids pytest would run"""
+    result = subprocess.run(
+        [sys.executable, '-m', 'pytest', 'tests/', '--collect-only', '-q'],
+        capture_output=True, text=True
+    )
+    return [line.strip() for line in result.stdout.splitlines() if '::' in line]
+
+def load_durations():
+    """Load historical per-test durations"""
+    try:
+        with open(DURATIONS_FILE) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def save_durations(durations, results):
+    """Fold the durations of this run into the history (exponential moving average)"""
+    for nodeid, result in results.items():
+        previous = durations.get(nodeid)
+        duration = result['duration']
+        durations[nodeid] = duration if previous is None else 0.5 * previous + 0.5 * duration
+    with open(DURATIONS_FILE, 'w') as f:
+        json.dump(durations, f, indent=2, sort_keys=True)
+
+def plan_shards(tests, durations, workers):
+    """Split tests into shards of similar expected duration (longest first, onto the lightest shard)"""
+    known = [durations[t] for t in tests if t in durations]
+    fallback = sorted(known)[len(known) // 2] if known else DEFAULT_DURATION
+
+    shards = [{'tests': [], 'expected': 0.0} for _ in range(workers)]
+    for test in sorted(tests, key=lambda t: durations.get(t, fallback), reverse=True):
+        shard = min(shards, key=lambda s: s['expected'])
+        shard['tests'].append(test)
+        shard['expected'] += durations.get(test, fallback)
+    return [shard for shard in shards if shard['tests']]
+
+def write_report_index(path, results, shard_reports, wall_time, trend_html=''):
+    """Write an index page: combined counts, one row per test and links to the shard reports.
+    
+    Screenshots, logs and other pytest-html details stay in the per-shard reports.
+    """
+    counts = {}
+    for result in results.values():
+        counts[result['outcome']] = counts.get(result['outcome'], 0) + 1
+
+    rows = "\n".join(
+        f"<tr class='{html.escape(r['outcome'])}'><td>{html.escape(nodeid)}</td><td>{html.escape(r['outcome'])}</td>"
+        f"<td>{r['duration']:.2f}s</td><td>{r['shard']}</td></tr>"
+        for nodeid, r in sorted(results.items())
+    )
+    links = "\n".join(
+        f"<li><a href='{html.escape(os.path.basename(report))}'>Shard {i}</a></li>"
+        for i, report in enumerate(shard_reports)
+    )
+    summary = ", ".join(f"{count} {outcome}" for outcome, count in sorted(counts.items()))
+    page = f"""<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>Kalp Network - Exploratory Test Report</title>
+<style>
+body {{ font-family: sans-serif; }} td, th {{ padding: 4px 8px; text-align: left; }}
+.passed {{ color: green; }} .failed, .error {{ color: red; }} .skipped {{ color: gray; }}
+</style></head><body>
+<h1>Kalp Network - Exploratory Test Report</h1>
+<p>{len(results)} tests: {summary}. Wall-clock time {wall_time:.1f}s across {len(shard_reports)} shards.</p>
+<h2>Shard reports</h2><ul>{links}</ul>
+<h2>Results</h2>
+<table><tr><th>Test</th><th>Outcome</th><th>Duration</th><th>Shard</th></tr>
+{rows}
+</table>
+{trend_html}
+</body></html>
+"""
+    with open(path, 'w') as f:
+        f.write(page)
+
+def run_tests_parallel(workers):
+    """Run the suite in timing-balanced shards, one pytest process (and browser) each"""
+    if not os.path.exists('reports'):
+        os.makedirs('reports')
+
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    durations = load_durations()
+    shards = plan_shards(collect_tests(), durations, workers)
+    if not shards:
+        print("No tests collected")
+        return 1
+
+    print(f"Starting Kalp Network Exploratory Testing in {len(shards)} parallel shards...")
+    print("=" * 60)
+
+    started = datetime.now()
+    processes = []
+    for i, shard in enumerate(shards):
+        html_report = f'reports/test_report_{timestamp}_shard{i}.html'
+        results_json = f'reports/test_results_{timestamp}_shard{i}.json'
+        log_path = f'reports/test_output_{timestamp}_shard{i}.log'
+        cmd = [
+            sys.executable, '-m', 'pytest',
+            *shard['tests'],
+            '-v',
+            '--tb=short',
+            f'--html={html_report}',
+            '--self-contained-html',
+        ]
+        env = dict(os.environ, TEST_RESULTS_JSON=results_json, PERF_RUN_ID=timestamp)
+        print(f"Shard {i}: {len(shard['tests'])} tests, ~{shard['expected']:.0f}s expected")
+        log = open(log_path, 'w')
+        processes.append({
+            'process': subprocess.Popen(cmd, env=env, stdout=log, stderr=subprocess.STDOUT),
+            'log': log,
+            'html': html_report,
+            'json': results_json,
+            'log_path': log_path,
+        })
+
+    returncode = 0
+    results = {}
+    for i, shard in enumerate(processes):
+        returncode = max(returncode, shard['process'].wait())
+        shard['log'].close()
+        try:
+            with open(shard['json']) as f:
+                for nodeid, result in json.load(f).items():
+                    results[nodeid] = dict(result, shard=i)
+        except (OSError, ValueError):
+            print(f"Shard {i} produced no results, see {shard['log_path']}")
+            returncode = returncode or 1
+    wall_time = (datetime.now() - started).total_seconds()
+
+    save_durations(durations, results)
+    merged_json = f'reports/test_results_{timestamp}.json'
+    with open(merged_json, 'w') as f:
+        json.dump(results, f, indent=2, sort_keys=True)
+    merged_html = f'reports/test_report_{timestamp}.html'
+    history = PerfHistory()
+    trend_html = trend_table_html(history.compare(timestamp))
+    history.close()
+    write_report_index(merged_html, results, [p['html'] for p in processes], wall_time, trend_html)
+
+    print("\n" + "=" * 60)
+    print(f"Test execution completed in {wall_time:.1f}s!")
+    print(f"Report generated: {merged_html}")
+    print(f"Results: {merged_json}")
+    print("Screenshots saved in: screenshots/")
+    print("=" * 60)
+
+    return returncode
+
 if __name__ == "__main__":
-    exit_code = run_tests()
-    sys.exit(exit_code)
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Run the Kalp Network test suite")
+    parser.add_argument('-n', '--workers', type=int, default=int(os.getenv('TEST_WORKERS', '1')),
+                        help="number of parallel shards, each with its own browser (default 1)")
+    args = parser.parse_args()
+
+    if args.workers > 1:
+        exit_code = run_tests_parallel(args.workers)
+    else:
+        exit_code = run_tests()
+    sys.exit(exit_code)
@@ -3,9 +3,31 @@ Pytest configuration and fixtures
 """
 import pytest
 import os
+import json
 from datetime import datetime
 from config.config import Config
 from pages.home_page import HomePage
+from utils.driver_pool import DriverPool
+from utils.perf_history import PerfHistory, trend_table_html
+from utils.site_mirror import MirrorServer
+
+# Outcome and total duration per test node id, written out for run_tests.py shards
+_test_results = {}
+# Node ids of tests that drove a browser; only their durations go into the history
+_browser_tests = set()
+
+# Parallel shards share one run id (set by run_tests.py) so their samples form one run
+PERF_RUN_ID = os.getenv('PERF_RUN_ID') or datetime.now().strftime("%Y%m%d_%H%M%S")
+_perf_history = None
+_perf_rows = None
+_mirror_server = None
+
+def get_perf_history():
+    """Open the performance history on first use"""
+    global _perf_history
+    if _perf_history is None:
+        _perf_history = PerfHistory()
+    return _perf_history
 
 @pytest.fixture(scope="session")
 def setup_directories():
@@ -15,12 +37,35 @@ def setup_directories():
         if not os.path.exists(directory):
             os.makedirs(directory)
 
+@pytest.fixture(scope="session")
+def driver_pool():
+    """Pool of warm browser sessions shared by the whole test session"""
+    pool = DriverPool(Config.get_driver, max_size=Config.DRIVER_POOL_SIZE)
+    yield pool
+    pool.close()
+
 @pytest.fixture(scope="function")
-def driver(setup_directories):
+def driver(setup_directories, driver_pool):
     """WebDriver fixture"""
-    driver = Config.get_driver()
+    if not Config.REUSE_DRIVER:
+        driver = Config.get_driver()
+        yield driver
+        driver.quit()
+        return
+    
+    driver = driver_pool.acquire()
     yield driver
-    driver.quit()
+    driver_pool.release(driver)
+
+@pytest.fixture(scope="session")
+def perf_history():
+    """Performance history shared by the test session"""
+    return get_perf_history()
+
+@pytest.fixture(scope="session")
+def perf_run_id():
+    """Run id under which this session's performance samples are stored"""
+    return PERF_RUN_ID
 
 @pytest.fixture(scope="function")
 def home_page(driver):
@@ -34,6 +79,8 @@ def pytest_runtest_makereport(item, call):
     """Take screenshot on test failure"""
     outcome = yield
     rep = outcome.get_result()
+    if "driver" in item.fixturenames:
+        _browser_tests.add(item.nodeid)
     
     if rep.when == "call" and rep.failed:
         if hasattr(item, "funcargs") and "driver" in item.funcargs:
@@ -47,8 +94,62 @@ def pytest_runtest_makereport(item, call):
 
 def pytest_configure(config):
     """Configure pytest"""
+    global _mirror_server
     if not os.path.exists(Config.REPORT_DIR):
         os.makedirs(Config.REPORT_DIR)
+    
+    # Serve a local capture of the site and point the suite at it
+    if Config.MIRROR_DIR:
+        _mirror_server = MirrorServer(Config.MIRROR_DIR).start()
+        Config.BASE_URL = _mirror_server.url
+        print(f"Testing against mirror of {Config.MIRROR_DIR} at {Config.BASE_URL}")
+
+def pytest_unconfigure(config):
+    """Stop the mirror server"""
+    if _mirror_server is not None:
+        _mirror_server.stop()
+
+def pytest_runtest_logreport(report):
+    """Accumulate outcome and duration per test for TEST_RESULTS_JSON"""
+    entry = _test_results.setdefault(report.nodeid, {'outcome': 'passed', 'duration': 0.0})
+    entry['duration'] += report.duration
+    if report.failed:
+        entry['outcome'] = 'error' if report.when != 'call' else 'failed'
+    elif report.skipped:
+        entry['outcome'] = 'skipped'
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_sessionfinish(session, exitstatus):
+    """Write per-test results to TEST_RESULTS_JSON (used by run_tests.py shards) and the history"""
+    global _perf_rows
+    path = os.getenv('TEST_RESULTS_JSON')
+    if path:
+        with open(path, 'w') as f:
+            json.dump(_test_results, f, indent=2)
+    
+    # Unit test runs would only add noise (and a database file) to the history
+    browser_results = {nodeid: r for nodeid, r in _test_results.items() if nodeid in _browser_tests}
+    if browser_results:
+        history = get_perf_history()
+        history.record_test_durations(PERF_RUN_ID, browser_results)
+        _perf_rows = history.compare(PERF_RUN_ID)
+
+def pytest_html_results_summary(prefix, summary, postfix, session):
+    """Add the performance trend table to the HTML report"""
+    if _perf_rows is not None:
+        postfix.append(trend_table_html(_perf_rows))
+
+def pytest_terminal_summary(terminalreporter):
+    """List performance regressions against the rolling baseline"""
+    regressions = [row for row in _perf_rows or [] if row['regression']]
+    if regressions:
+        terminalreporter.section("performance regressions")
+        for row in regressions:
+            change = f"{row['change']:+.1%}, " if row['change'] is not None else ""
+            terminalreporter.write_line(
+                f"{row['subject']} {row['metric']}: {row['value']:.3f} vs median "
+                f"{row['median']:.3f} ({change}z={row['z']:.1f})"
+            )
 
 def pytest_html_report_title(report):
     """Customize HTML report title"""
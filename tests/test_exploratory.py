@@ -2,7 +2,6 @@
 Additional exploratory tests for comprehensive coverage
 """
 import pytest
-import time
 import random
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
@@ -27,7 +26,7 @@ class TestExploratoryScenarios:
                     
                     # Navigate to link
                     home_page.navigate_to(link['url'])
-                    time.sleep(2)
+                    home_page.wait_for_dom_quiet()
                     
                     # Basic checks on the new page
                     assert home_page.driver.title, "Page should have a title"
@@ -107,7 +106,7 @@ class TestExploratoryScenarios:
                 try:
                     # Press Tab
                     home_page.driver.switch_to.active_element.send_keys(Keys.TAB)
-                    time.sleep(0.5)
+                    home_page.wait_for_dom_quiet(quiet_ms=100)
                     
                     # Get currently focused element
                     focused = home_page.driver.switch_to.active_element
@@ -133,7 +132,7 @@ class TestExploratoryScenarios:
             if focusable_elements:
                 try:
                     home_page.driver.switch_to.active_element.send_keys(Keys.ENTER)
-                    time.sleep(1)
+                    home_page.wait_for_page_settled()
                     print("Enter key interaction tested")
                 except:
                     pass
@@ -154,20 +153,20 @@ class TestExploratoryScenarios:
             # Click first navigable link
             first_link = navigable_links[0]
             first_link.click()
-            time.sleep(2)
+            home_page.wait_for_navigation(original_url)
             
             new_url = home_page.get_current_url()
             
             # Test back button
             home_page.driver.back()
-            time.sleep(2)
+            home_page.wait_for_navigation(new_url)
             
             back_url = home_page.get_current_url()
             assert back_url == original_url, "Back button should return to original page"
             
             # Test forward button
             home_page.driver.forward()
-            time.sleep(2)
+            home_page.wait_for_navigation(back_url)
             
             forward_url = home_page.get_current_url()
             assert forward_url == new_url, "Forward button should return to second page"
@@ -180,17 +179,17 @@ class TestExploratoryScenarios:
         
         # Test zoom in
         home_page.driver.execute_script("document.body.style.zoom='150%'")
-        time.sleep(2)
+        home_page.wait_for_layout()
         home_page.take_screenshot("zoom_150_percent")
         
         # Test zoom out
         home_page.driver.execute_script("document.body.style.zoom='75%'")
-        time.sleep(2)
+        home_page.wait_for_layout()
         home_page.take_screenshot("zoom_75_percent")
         
         # Reset zoom
         home_page.driver.execute_script("document.body.style.zoom='100%'")
-        time.sleep(1)
+        home_page.wait_for_layout()
         
         print("Zoom functionality tested")
     
@@ -223,7 +222,7 @@ class TestExploratoryScenarios:
                 from selenium.webdriver.common.action_chains import ActionChains
                 actions = ActionChains(home_page.driver)
                 actions.context_click(element).perform()
-                time.sleep(1)
+                home_page.wait_for_dom_quiet(quiet_ms=100)
                 
                 # Take screenshot to capture context menu if visible
                 home_page.take_screenshot("right_click_context_menu")
@@ -253,7 +252,7 @@ class TestExploratoryScenarios:
                     from selenium.webdriver.common.action_chains import ActionChains
                     actions = ActionChains(home_page.driver)
                     actions.double_click(element).perform()
-                    time.sleep(1)
+                    home_page.wait_for_dom_quiet(quiet_ms=100)
                     
                     # Take screenshot of selected text
                     home_page.take_screenshot("text_selection")
@@ -268,21 +267,21 @@ class TestExploratoryScenarios:
         # Test rapid scrolling
         for _ in range(5):
             home_page.driver.execute_script("window.scrollBy(0, 200);")
-            time.sleep(0.1)
+        home_page.wait_for_scroll_settled()
         
         # Test scroll to specific positions
         positions = [0, 500, 1000, 9999999]  # Last one tests max scroll
         
         for pos in positions:
             home_page.driver.execute_script(f"window.scrollTo(0, {pos});")
-            time.sleep(0.5)
+            home_page.wait_for_scroll_settled()
             
             current_scroll = home_page.driver.execute_script("return window.pageYOffset;")
             print(f"Scrolled to position: {current_scroll}")
         
         # Test horizontal scroll if applicable
         home_page.driver.execute_script("window.scrollTo(100, 0);")
-        time.sleep(0.5)
+        home_page.wait_for_scroll_settled()
         
         horizontal_scroll = home_page.driver.execute_script("return window.pageXOffset;")
         print(f"Horizontal scroll position: {horizontal_scroll}")
@@ -0,0 +1,92 @@
+"""
+Vectorized daily forecast aggregation against a naive per-slot reference
+"""
+import random
+from collections import Counter, defaultdict
+from datetime import datetime, timedelta, timezone
+import pytest
+from weather.forecast import CONDITIONS, daily_forecasts
+
+ICONS = [f'{prefix}{suffix}' for prefix, _ in CONDITIONS for suffix in 'dn'] + ['99d']
+
+def make_payload(rng, start, offset, icons=ICONS, slots=40):
+    """A 3-hourly forecast payload with random temperatures and icons"""
+    return {
+        'cod': '200',
+        'city': {'timezone': offset},
+        'list': [
+            {'dt': start + i * 10800,
+             'main': {'temp': round(rng.uniform(-20, 40), 2)},
+             'weather': [{'icon': rng.choice(icons)}]}
+            for i in range(slots)
+        ],
+    }
+
+def naive_daily(payload):
+    """Group slots by local calendar date one at a time"""
+    offset = payload['city']['timezone']
+    temps = defaultdict(list)
+    conditions = defaultdict(Counter)
+    prefixes = [prefix for prefix, _ in CONDITIONS]
+    for entry in payload['list']:
+        date = (datetime.fromtimestamp(entry['dt'], tz=timezone.utc) + timedelta(seconds=offset)).date()
+        temps[date].append(entry['main']['temp'])
+        prefix = entry['weather'][0]['icon'][:2]
+        if prefix in prefixes:
+            conditions[date][prefixes.index(prefix)] += 1
+
+    days = []
+    for date in sorted(temps):
+        counts = conditions[date]
+        # Ties go to the lower condition index, as with argmax
+        dominant = min(counts, key=lambda i: (-counts[i], i)) if counts else None
+        days.append({
+            'date': date.isoformat(),
+            'temp_min': round(min(temps[date]), 2),
+            'temp_max': round(max(temps[date]), 2),
+            'temp_mean': round(sum(temps[date]) / len(temps[date]), 2),
+            'icon': None if dominant is None else f'{CONDITIONS[dominant][0]}d',
+            'description': None if dominant is None else CONDITIONS[dominant][1],
+        })
+    return days
+
+def assert_matches_reference(payloads):
+    for actual, payload in zip(daily_forecasts(payloads), payloads):
+        expected = naive_daily(payload)
+        assert [day['date'] for day in actual] == [day['date'] for day in expected]
+        for got, want in zip(actual, expected):
+            for field in ('temp_min', 'temp_max', 'temp_mean'):
+                assert got[field] == pytest.approx(want[field], abs=0.011)
+            assert (got['icon'], got['description']) == (want['icon'], want['description'])
+
+class TestDailyForecasts:
+
+    def test_matches_naive_reference(self):
+        """Random cities across time zones agree with the per-slot reference"""
+        rng = random.Random(29)
+        payloads = [
+            make_payload(rng, 1700000000 + rng.randrange(0, 86400), rng.choice([-36000, -18000, 0, 19800, 45900]))
+            for _ in range(200)
+        ]
+        assert_matches_reference(payloads)
+
+    def test_short_and_empty_forecasts(self):
+        """Payloads with fewer slots (or none) are padded without leaking into other rows"""
+        rng = random.Random(7)
+        payloads = [
+            make_payload(rng, 1700000000, 19800, slots=5),
+            {'cod': '200', 'city': {'timezone': 0}, 'list': []},
+            make_payload(rng, 1700003600, -18000),
+        ]
+        assert_matches_reference(payloads)
+        assert daily_forecasts(payloads)[1] == []
+
+    def test_unknown_conditions_are_not_clear_sky(self):
+        """Days with only unrecognized icons have no dominant condition"""
+        rng = random.Random(3)
+        days = daily_forecasts([make_payload(rng, 1700000000, 0, icons=['99d'], slots=8)])[0]
+        assert days
+        assert all(day['icon'] is None and day['description'] is None for day in days)
+
+    def test_no_payloads(self):
+        assert daily_forecasts([]) == []
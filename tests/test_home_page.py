@@ -2,16 +2,18 @@
 Home page exploratory tests
 """
 import pytest
-import time
+from urllib.parse import urlparse
+from config.config import Config
 from utils.helpers import TestHelpers
 from utils.test_data import TestData
+from utils.page_metrics import report_extras, threshold_violations
 
 class TestHomePage:
     
     def test_page_loads_successfully(self, home_page):
         """Test that the home page loads successfully"""
         assert "kalp" in home_page.get_page_title().lower()
-        assert "kalp.network" in home_page.get_current_url()
+        assert urlparse(Config.BASE_URL).netloc in home_page.get_current_url()
     
     def test_page_elements_present(self, home_page):
         """Test that key page elements are present"""
@@ -42,14 +44,14 @@ class TestHomePage:
                         # Click link and verify page loads
                         original_url = home_page.get_current_url()
                         link.click()
-                        time.sleep(2)
+                        home_page.wait_for_navigation(original_url)
                         
                         new_url = home_page.get_current_url()
                         assert new_url != original_url or "#" in href, f"Link {link_text} should navigate somewhere"
                         
                         # Go back to home page for next test
                         home_page.driver.back()
-                        time.sleep(2)
+                        home_page.wait_for_navigation(new_url)
                         
                 except Exception as e:
                     print(f"Error testing link {i}: {e}")
@@ -69,18 +71,25 @@ class TestHomePage:
             # Take screenshot for each viewport
             home_page.take_screenshot(f"responsive_{size[0]}x{size[1]}")
     
-    def test_page_performance(self, home_page):
+    def test_page_performance(self, home_page, extras, perf_history, perf_run_id):
         """Test page load performance"""
-        load_time = TestHelpers.measure_page_load_time(
+        metrics = TestHelpers.collect_page_metrics(
             home_page.driver, 
             home_page.get_current_url()
         )
+        extras.extend(report_extras(metrics))
+        perf_history.record_page_metrics(perf_run_id, metrics)
         
-        print(f"Page load time: {load_time:.2f} seconds")
+        print(f"Page load time: {metrics['navigation'].get('page_load_time')} seconds")
+        for section in ('navigation', 'paint'):
+            for name, value in metrics[section].items():
+                print(f"  {name}: {value}")
+        print(f"  Resources: {metrics['resources']['count']} "
+              f"({metrics['resources']['transfer_bytes']} bytes)")
         
         # Performance assertion
-        assert load_time < TestData.PERFORMANCE_THRESHOLDS['page_load_time'], \
-            f"Page load time {load_time:.2f}s exceeds threshold"
+        violations = threshold_violations(metrics, TestData.PERFORMANCE_THRESHOLDS)
+        assert not violations, f"Performance thresholds exceeded: {', '.join(violations)}"
     
     def test_broken_links(self, home_page):
         """Test for broken links on the page"""
@@ -174,7 +183,7 @@ class TestHomePage:
                     
                     # Scroll to button and hover
                     home_page.driver.execute_script("arguments[0].scrollIntoView(true);", button)
-                    time.sleep(1)
+                    home_page.wait_for_scroll_settled()
                     
                     # Check if button is clickable
                     assert button.is_enabled(), f"CTA button '{button_text}' should be enabled"
@@ -191,7 +200,7 @@ class TestHomePage:
         
         # Scroll to bottom
         home_page.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-        time.sleep(2)
+        home_page.wait_for_scroll_settled()
         
         # Get final scroll position
         final_scroll = home_page.driver.execute_script("return window.pageYOffset;")
@@ -200,7 +209,7 @@ class TestHomePage:
         
         # Scroll back to top
         home_page.driver.execute_script("window.scrollTo(0, 0);")
-        time.sleep(1)
+        home_page.wait_for_scroll_settled()
         
         top_scroll = home_page.driver.execute_script("return window.pageYOffset;")
         assert top_scroll == 0, "Should be able to scroll back to top"
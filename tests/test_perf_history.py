@@ -0,0 +1,84 @@
+"""
+Regression detection in the performance history
+"""
+import pytest
+from config.config import Config
+from utils.perf_history import PerfHistory, page_subject
+
+class TestPerfHistoryCompare:
+
+    @pytest.fixture
+    def history(self, tmp_path):
+        """Empty history in a temporary file"""
+        history = PerfHistory(str(tmp_path / "perf_history.db"))
+        yield history
+        history.close()
+
+    def record_runs(self, history, metric, values):
+        """Record one run per value; the last one is the run under test"""
+        for i, value in enumerate(values):
+            history.record(f"run{i}", "https://example.test/", {metric: value})
+        return f"run{len(values) - 1}"
+
+    def compare_one(self, history, run_id):
+        """The single compare() row of a run"""
+        rows = history.compare(run_id)
+        assert len(rows) == 1
+        return rows[0]
+
+    def test_clear_regression_is_flagged(self, history):
+        """A load time far outside a noisy baseline is flagged"""
+        run_id = self.record_runs(history, "page_load_time", [1.0, 1.1, 0.9, 1.05, 0.95, 1.0, 2.5])
+        row = self.compare_one(history, run_id)
+        assert row['regression']
+        assert row['median'] == pytest.approx(1.0)
+        assert row['samples'] == 6
+
+    def test_value_within_noise_is_not_flagged(self, history):
+        """A value inside the baseline spread is not flagged"""
+        run_id = self.record_runs(history, "page_load_time", [1.0, 1.1, 0.9, 1.05, 0.95, 1.0, 1.08])
+        assert not self.compare_one(history, run_id)['regression']
+
+    def test_jitter_on_zero_baseline_is_not_flagged(self, history):
+        """dns=0.001 after six runs of 0.0 is below the absolute floor"""
+        run_id = self.record_runs(history, "dns", [0.0] * 6 + [0.001])
+        row = self.compare_one(history, run_id)
+        assert row['z'] == float('inf')
+        assert not row['regression']
+
+    def test_large_move_on_flat_baseline_is_flagged(self, history):
+        """A flat baseline still flags a move above the absolute floor"""
+        run_id = self.record_runs(history, "dns", [0.0] * 6 + [0.3])
+        assert self.compare_one(history, run_id)['regression']
+
+    def test_small_count_change_is_not_flagged(self, history):
+        """Counts need to grow by at least one, bytes by at least 10 KiB"""
+        run_id = self.record_runs(history, "script_bytes", [50000] * 6 + [52000])
+        assert not self.compare_one(history, run_id)['regression']
+
+    def test_too_few_samples_is_never_flagged(self, history):
+        """Series shorter than PERF_MIN_SAMPLES are reported but not flagged"""
+        run_id = self.record_runs(history, "page_load_time", [1.0, 1.0, 5.0])
+        row = self.compare_one(history, run_id)
+        assert row['samples'] == 2
+        assert not row['regression']
+
+class TestPageSubject:
+
+    def test_pages_are_keyed_by_path(self, monkeypatch):
+        """The same page keeps one series whatever port the server listens on"""
+        monkeypatch.setattr(Config, 'MIRROR_DIR', None)
+        for port in (41001, 41002):
+            monkeypatch.setattr(Config, 'BASE_URL', f'http://127.0.0.1:{port}/')
+            assert page_subject(f'http://127.0.0.1:{port}/') == '/'
+            assert page_subject(f'http://127.0.0.1:{port}/about/') == '/about/'
+
+    def test_mirror_runs_have_their_own_series(self, monkeypatch):
+        """Mirror timings are not mixed with those of the live site"""
+        monkeypatch.setattr(Config, 'MIRROR_DIR', 'mirror')
+        monkeypatch.setattr(Config, 'BASE_URL', 'http://127.0.0.1:41001/')
+        assert page_subject('http://127.0.0.1:41001/about/') == 'mirror:/about/'
+
+    def test_other_sites_keep_their_url(self, monkeypatch):
+        monkeypatch.setattr(Config, 'BASE_URL', 'https://kalp.network/')
+        assert page_subject('https://example.com/x') == 'https://example.com/x'
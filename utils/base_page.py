@@ -2,7 +2,6 @@
 Base page class with common functionality
 """
 import os
-import time
 from datetime import datetime
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
@@ -11,6 +10,84 @@ from selenium.webdriver.common.action_chains import ActionChains
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
 from config.config import Config
 
+# In-browser wait scripts: each resolves as soon as its condition has held for a quiet
+# window (arguments[0], ms), or with false after arguments[1] ms, in one driver round-trip
+SCROLL_SETTLED_JS = """
+var quiet = arguments[0], maxMs = arguments[1], done = arguments[arguments.length - 1];
+var start = performance.now(), stableSince = start;
+var lastX = window.pageXOffset, lastY = window.pageYOffset;
+function check() {
+    var now = performance.now();
+    if (window.pageXOffset !== lastX || window.pageYOffset !== lastY) {
+        lastX = window.pageXOffset; lastY = window.pageYOffset; stableSince = now;
+    }
+    if (now - stableSince >= quiet) { done(true); }
+    else if (now - start >= maxMs) { done(false); }
+    else { setTimeout(check, 16); }
+}
+setTimeout(check, 16);
+"""
+
+RESIZE_SETTLED_JS = """
+var quiet = arguments[0], maxMs = arguments[1], done = arguments[arguments.length - 1];
+var start = performance.now(), stableSince = start;
+var lastW = window.innerWidth, lastH = window.innerHeight;
+function onResize() { stableSince = performance.now(); }
+window.addEventListener('resize', onResize);
+function finish(result) { window.removeEventListener('resize', onResize); done(result); }
+function check() {
+    var now = performance.now();
+    if (window.innerWidth !== lastW || window.innerHeight !== lastH) {
+        lastW = window.innerWidth; lastH = window.innerHeight; stableSince = now;
+    }
+    if (now - stableSince >= quiet) { requestAnimationFrame(function () { finish(true); }); }
+    else if (now - start >= maxMs) { finish(false); }
+    else { setTimeout(check, 16); }
+}
+setTimeout(check, 16);
+"""
+
+# Style changes such as CSS zoom fire no resize event: force a layout, then wait for two
+# animation frames so the new layout has been painted
+LAYOUT_SETTLED_JS = """
+var maxMs = arguments[1], done = arguments[arguments.length - 1];
+var limit = setTimeout(function () { done(false); }, maxMs);
+document.body.getBoundingClientRect();
+requestAnimationFrame(function () {
+    requestAnimationFrame(function () { clearTimeout(limit); done(true); });
+});
+"""
+
+NETWORK_IDLE_JS = """
+var quiet = arguments[0], maxMs = arguments[1], done = arguments[arguments.length - 1];
+var start = performance.now(), stableSince = start, count = -1;
+function check() {
+    var now = performance.now();
+    var n = performance.getEntriesByType('resource').length;
+    if (n !== count || document.readyState !== 'complete') { count = n; stableSince = now; }
+    if (now - stableSince >= quiet) { done(true); }
+    else if (now - start >= maxMs) { done(false); }
+    else { setTimeout(check, 50); }
+}
+check();
+"""
+
+DOM_QUIET_JS = """
+var quiet = arguments[0], maxMs = arguments[1], done = arguments[arguments.length - 1];
+var timer, finished = false;
+function finish(result) {
+    if (finished) { return; }
+    finished = true; observer.disconnect(); clearTimeout(timer); clearTimeout(limit); done(result);
+}
+var observer = new MutationObserver(function () {
+    clearTimeout(timer);
+    timer = setTimeout(function () { finish(true); }, quiet);
+});
+observer.observe(document, {childList: true, subtree: true, attributes: true, characterData: true});
+timer = setTimeout(function () { finish(true); }, quiet);
+var limit = setTimeout(function () { finish(false); }, maxMs);
+"""
+
 class BasePage:
     def __init__(self, driver):
         self.driver = driver
@@ -76,7 +153,60 @@ class BasePage:
         """Scroll to element"""
         element = self.find_element(locator)
         self.driver.execute_script("arguments[0].scrollIntoView(true);", element)
-        time.sleep(1)
+        self.wait_for_scroll_settled()
+    
+    def _wait_in_browser(self, script, quiet_ms, timeout):
+        """Run one of the wait scripts; True if it settled, False if it hit the timeout"""
+        timeout = timeout or Config.SETTLE_TIMEOUT
+        # Leave the driver-side limit above the in-browser one so the script reports first,
+        # then put back the caller's limit so it does not leak into later scripts
+        previous = self.driver.timeouts.script
+        self.driver.set_script_timeout(timeout + 5)
+        try:
+            return bool(self.driver.execute_async_script(script, quiet_ms, timeout * 1000))
+        except TimeoutException:
+            return False
+        finally:
+            self.driver.set_script_timeout(previous)
+    
+    def wait_for_scroll_settled(self, quiet_ms=100, timeout=None):
+        """Wait until the scroll position stops changing (smooth scrolling has finished)"""
+        return self._wait_in_browser(SCROLL_SETTLED_JS, quiet_ms, timeout)
+    
+    def wait_for_resize(self, quiet_ms=100, timeout=None):
+        """Wait until the viewport has stopped resizing and the next frame has been laid out"""
+        return self._wait_in_browser(RESIZE_SETTLED_JS, quiet_ms, timeout)
+    
+    def wait_for_layout(self, timeout=None):
+        """Wait until a frame has been laid out and painted after a style change (e.g. zoom)"""
+        return self._wait_in_browser(LAYOUT_SETTLED_JS, 0, timeout)
+    
+    def wait_for_network_idle(self, quiet_ms=500, timeout=None):
+        """Wait until the page is loaded and no new resources have finished for quiet_ms"""
+        return self._wait_in_browser(NETWORK_IDLE_JS, quiet_ms, timeout)
+    
+    def wait_for_dom_quiet(self, quiet_ms=200, timeout=None):
+        """Wait until the DOM has had no mutations for quiet_ms"""
+        return self._wait_in_browser(DOM_QUIET_JS, quiet_ms, timeout)
+    
+    def wait_for_url_change(self, previous_url, timeout=None):
+        """Wait until the URL differs from previous_url; False if it never does"""
+        try:
+            WebDriverWait(self.driver, timeout or Config.SETTLE_TIMEOUT).until(EC.url_changes(previous_url))
+            return True
+        except TimeoutException:
+            return False
+    
+    def wait_for_page_settled(self, timeout=None):
+        """Wait for the document to finish loading and its DOM to go quiet"""
+        self.wait_for_page_load()
+        return self.wait_for_dom_quiet(timeout=timeout)
+    
+    def wait_for_navigation(self, previous_url, timeout=None):
+        """Wait for a navigation away from previous_url to load and settle"""
+        changed = self.wait_for_url_change(previous_url, timeout)
+        self.wait_for_page_settled(timeout)
+        return changed
     
     def hover_over_element(self, locator):
         """Hover over element"""
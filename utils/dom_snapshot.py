@@ -0,0 +1,68 @@
+"""
+Bulk DOM extraction: gather the data a helper check needs in one execute_script call
+"""
+
+SNAPSHOT_JS = """
+var sections = arguments[0], selector = arguments[1];
+function rendered(el) { return el.getClientRects().length > 0; }
+function visibleText(el) { return rendered(el) ? el.innerText.trim() : ''; }
+function displayed(el) {
+    if (!rendered(el)) { return false; }
+    var style = window.getComputedStyle(el);
+    return style.visibility !== 'hidden' && style.visibility !== 'collapse' && parseFloat(style.opacity) !== 0;
+}
+var collectors = {
+    title: function () { return document.title; },
+    meta_description: function () {
+        var meta = document.querySelector("meta[name='description']");
+        return meta ? meta.getAttribute('content') || '' : null;
+    },
+    headings: function () {
+        var headings = {};
+        for (var i = 1; i <= 6; i++) {
+            headings['h' + i] = Array.from(document.getElementsByTagName('h' + i), visibleText);
+        }
+        return headings;
+    },
+    links: function () {
+        return Array.from(document.getElementsByTagName('a'))
+            .filter(function (a) { return a.getAttribute('href') !== null; })
+            .map(function (a) { return {url: a.href, text: visibleText(a)}; });
+    },
+    images: function () {
+        return Array.from(document.getElementsByTagName('img'), function (img) {
+            return {
+                src: img.src,
+                alt: img.getAttribute('alt'),
+                loaded: img.complete && img.naturalHeight !== 0
+            };
+        });
+    },
+    elements: function () {
+        return Array.from(document.querySelectorAll(selector)).filter(displayed).map(function (el) {
+            var rect = el.getBoundingClientRect();
+            return {
+                tag: el.tagName.toLowerCase(),
+                'class': el.getAttribute('class'),
+                size: {height: rect.height, width: rect.width},
+                location: {x: Math.round(rect.left + window.scrollX), y: Math.round(rect.top + window.scrollY)},
+                visible: true
+            };
+        });
+    }
+};
+var result = {origin: window.location.origin};
+sections.forEach(function (name) { result[name] = collectors[name](); });
+return result;
+"""
+
+SECTIONS = ('title', 'meta_description', 'headings', 'links', 'images', 'elements')
+
+def snapshot(driver, *sections, selector=None):
+    """Return {section: data} for the requested sections plus the page origin"""
+    unknown = set(sections) - set(SECTIONS)
+    if unknown:
+        raise ValueError(f"Unknown snapshot sections: {sorted(unknown)}")
+    if 'elements' in sections and not selector:
+        raise ValueError("The 'elements' section needs a CSS selector")
+    return driver.execute_script(SNAPSHOT_JS, list(sections), selector)
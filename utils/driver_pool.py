@@ -0,0 +1,100 @@
+"""
+Pool of warm WebDriver sessions reused across tests
+"""
+import threading
+from selenium.common.exceptions import WebDriverException
+from config.config import Config
+
+class DriverPool:
+    """Hands out browser sessions and resets them between tests instead of quitting"""
+    
+    def __init__(self, factory=None, max_size=1):
+        self.factory = factory or Config.get_driver
+        self.max_size = max_size
+        self._idle = []
+        self._window_sizes = {}
+        self._lock = threading.Lock()
+        self.created = 0
+        self.replaced = 0
+    
+    def _create(self):
+        """Start a new session and remember its initial window size"""
+        driver = self.factory()
+        self._window_sizes[id(driver)] = driver.get_window_size()
+        self.created += 1
+        return driver
+    
+    @staticmethod
+    def is_alive(driver):
+        """Check the session still answers commands"""
+        # A dead driver process surfaces as urllib3/connection errors, not WebDriverException
+        try:
+            driver.execute_script("return 1")
+            return True
+        except Exception:
+            return False
+    
+    def _discard(self, driver):
+        """Quit a session, ignoring errors from one that already crashed"""
+        self._window_sizes.pop(id(driver), None)
+        try:
+            driver.quit()
+        except Exception:
+            pass
+    
+    def acquire(self):
+        """Return a healthy session, replacing any that crashed while idle"""
+        while True:
+            with self._lock:
+                driver = self._idle.pop() if self._idle else None
+            if driver is None:
+                return self._create()
+            if self.is_alive(driver):
+                return driver
+            self._discard(driver)
+            self.replaced += 1
+    
+    def reset(self, driver):
+        """Return a session to a clean state: one blank window, no cookies or storage"""
+        handles = driver.window_handles
+        for handle in handles[1:]:
+            driver.switch_to.window(handle)
+            driver.close()
+        driver.switch_to.window(handles[0])
+        
+        # Storage is per origin, so clear it before leaving the current page
+        try:
+            driver.execute_script("window.localStorage.clear(); window.sessionStorage.clear();")
+        except WebDriverException:
+            pass
+        driver.delete_all_cookies()
+        driver.get("about:blank")
+        
+        size = self._window_sizes.get(id(driver))
+        if size:
+            driver.set_window_size(size['width'], size['height'])
+        driver.implicitly_wait(Config.IMPLICIT_WAIT)
+        driver.set_page_load_timeout(Config.PAGE_LOAD_TIMEOUT)
+        driver.set_script_timeout(Config.SCRIPT_TIMEOUT)
+    
+    def release(self, driver):
+        """Reset a session and keep it for the next test, or quit it if it is broken"""
+        try:
+            self.reset(driver)
+        except Exception:
+            self._discard(driver)
+            self.replaced += 1
+            return
+        
+        with self._lock:
+            if len(self._idle) < self.max_size:
+                self._idle.append(driver)
+                return
+        self._discard(driver)
+    
+    def close(self):
+        """Quit every idle session"""
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for driver in idle:
+            self._discard(driver)
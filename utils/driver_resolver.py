@@ -0,0 +1,124 @@
+"""
+Resolve WebDriver binaries once per machine and browser version, working offline when possible
+"""
+import json
+import os
+import platform
+import re
+import shutil
+import subprocess
+import tempfile
+import threading
+
+# Executables to ask for a browser version, first one found wins
+BROWSER_BINARIES = {
+    'chrome': [
+        'google-chrome', 'google-chrome-stable', 'chromium', 'chromium-browser', 'chrome',
+        '/Applications/Google Chrome.app/Contents/MacOS/Google Chrome',
+    ],
+    'firefox': ['firefox', '/Applications/Firefox.app/Contents/MacOS/firefox'],
+}
+DRIVER_BINARIES = {'chrome': 'chromedriver', 'firefox': 'geckodriver'}
+# An explicit driver path skips resolution entirely
+DRIVER_ENV = {'chrome': 'CHROMEDRIVER_PATH', 'firefox': 'GECKODRIVER_PATH'}
+VERSION = re.compile(r'(\d+)\.[\d.]+')
+
+_resolved = {}
+_lock = threading.Lock()
+
+def _version_of(executable):
+    """Version string printed by `executable --version`, or None"""
+    path = shutil.which(executable) or (executable if os.path.isfile(executable) else None)
+    if not path:
+        return None
+    try:
+        output = subprocess.run([path, '--version'], capture_output=True, text=True, timeout=10).stdout
+    except (OSError, subprocess.SubprocessError):
+        return None
+    match = VERSION.search(output)
+    return match.group(0) if match else None
+
+def browser_fingerprint(browser):
+    """Browser, installed version and platform; a new browser version means a new driver"""
+    version = next(filter(None, map(_version_of, BROWSER_BINARIES[browser])), 'unknown')
+    return f"{browser}-{version}-{platform.system()}-{platform.machine()}"
+
+def _major(version):
+    return version.split('.')[0] if version else None
+
+def _system_driver(browser, fingerprint):
+    """Driver on PATH, if its major version fits the browser (geckodriver spans many releases)"""
+    path = shutil.which(DRIVER_BINARIES[browser])
+    if not path:
+        return None, False
+    browser_version = fingerprint.split('-')[1]
+    if browser != 'chrome' or browser_version == 'unknown':
+        return path, True
+    return path, _major(_version_of(path)) == _major(browser_version)
+
+def _load_cache(path):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def _save_cache(path, cache):
+    """Write atomically: parallel shards may resolve at the same time"""
+    directory = os.path.dirname(path) or '.'
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    with os.fdopen(fd, 'w') as f:
+        json.dump(cache, f, indent=2, sort_keys=True)
+    os.replace(tmp, path)
+
+def _download(browser):
+    """Fetch a matching driver with webdriver-manager (needs the network)"""
+    if browser == 'chrome':
+        from webdriver_manager.chrome import ChromeDriverManager
+        return ChromeDriverManager().install()
+    from webdriver_manager.firefox import GeckoDriverManager
+    return GeckoDriverManager().install()
+
+def _resolve(browser, cache_path):
+    override = os.getenv(DRIVER_ENV[browser])
+    if override:
+        return override
+    
+    fingerprint = browser_fingerprint(browser)
+    cache = _load_cache(cache_path)
+    cached = cache.get(fingerprint)
+    if cached and os.path.isfile(cached):
+        return cached
+    
+    system_path, compatible = _system_driver(browser, fingerprint)
+    if system_path and compatible:
+        path = system_path
+    else:
+        try:
+            path = _download(browser)
+        except Exception as e:
+            # Offline: a mismatched system driver or one cached for another version may still work
+            fallback = system_path or next(
+                (p for key, p in cache.items() if key.startswith(f"{browser}-") and os.path.isfile(p)), None
+            )
+            if fallback is None:
+                print(f"Could not resolve {DRIVER_BINARIES[browser]} ({e}); leaving it to Selenium Manager")
+                return None
+            print(f"Could not download {DRIVER_BINARIES[browser]} ({e}); using {fallback}")
+            return fallback
+    
+    cache[fingerprint] = path
+    _save_cache(cache_path, cache)
+    return path
+
+def resolve_driver(browser, cache_path):
+    """Path to the driver binary for browser, or None to let Selenium locate one itself.
+    
+    Resolved once per process. Across processes the path is cached in cache_path, keyed by
+    the browser version, so only a browser upgrade triggers a new lookup or download.
+    """
+    with _lock:
+        if browser not in _resolved:
+            _resolved[browser] = _resolve(browser, cache_path)
+        return _resolved[browser]
@@ -0,0 +1,92 @@
+"""
+Concurrent link checker with a per-session result cache
+"""
+import threading
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain, zip_longest
+from urllib.parse import urldefrag, urlparse
+import requests
+from requests.adapters import HTTPAdapter
+from config.config import Config
+
+class LinkChecker:
+    """Checks URLs over one pooled session, at most per_host requests to a host at a time"""
+    
+    def __init__(self, max_workers=None, per_host=None, timeout=None):
+        self.max_workers = max_workers or Config.LINK_CHECK_WORKERS
+        self.per_host = per_host or Config.LINK_CHECK_PER_HOST
+        self.timeout = timeout or Config.LINK_CHECK_TIMEOUT
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=self.max_workers, pool_maxsize=self.per_host)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self._results = {}
+        self._host_slots = defaultdict(lambda: threading.BoundedSemaphore(self.per_host))
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def normalize(url):
+        """Drop the fragment: #section links hit the same resource"""
+        return urldefrag(url)[0]
+    
+    def _request(self, url):
+        """HEAD the URL, retrying as a streamed GET for servers that refuse HEAD"""
+        response = self.session.head(url, timeout=self.timeout, allow_redirects=True)
+        if response.status_code == 405:
+            response = self.session.get(url, timeout=self.timeout, allow_redirects=True, stream=True)
+            response.close()
+        return response
+    
+    def _check(self, url):
+        """Check one URL, holding a slot for its host"""
+        with self._lock:
+            slots = self._host_slots[urlparse(url).netloc]
+        with slots:
+            try:
+                response = self._request(url)
+                result = {'url': url, 'status_code': response.status_code}
+            except requests.RequestException as e:
+                result = {'url': url, 'error': str(e)}
+        result['ok'] = 'error' not in result and result['status_code'] < 400
+        return result
+    
+    @staticmethod
+    def _interleave_hosts(urls):
+        """Order URLs round-robin by host so one slow host does not hold every worker"""
+        by_host = defaultdict(list)
+        for url in sorted(urls):
+            by_host[urlparse(url).netloc].append(url)
+        return [url for url in chain.from_iterable(zip_longest(*by_host.values())) if url]
+    
+    def check_all(self, urls):
+        """Return {url: result} for every URL, checking only those not seen this session"""
+        keys = {url: self.normalize(url) for url in urls}
+        with self._lock:
+            pending = self._interleave_hosts({key for key in keys.values() if key not in self._results})
+        if pending:
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(pending))) as executor:
+                for result in executor.map(self._check, pending):
+                    with self._lock:
+                        self._results[result['url']] = result
+        with self._lock:
+            return {url: self._results[key] for url, key in keys.items()}
+    
+    def check(self, url):
+        """Check a single URL"""
+        return self.check_all([url])[url]
+    
+    def close(self):
+        """Release the pooled connections"""
+        self.session.close()
+
+_shared_checker = None
+_shared_lock = threading.Lock()
+
+def shared_checker():
+    """Checker whose results are memoized for the whole test session"""
+    global _shared_checker
+    with _shared_lock:
+        if _shared_checker is None:
+            _shared_checker = LinkChecker()
+        return _shared_checker
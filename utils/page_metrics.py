@@ -0,0 +1,122 @@
+"""
+Page performance metrics read from the browser's Performance API
+"""
+import html
+from pytest_html import extras
+from config.config import Config
+
+# Resolves once the load event has finished, with Navigation Timing, Resource Timing,
+# paint, largest-contentful-paint and layout-shift data. Times are in seconds from navigation start.
+METRICS_JS = """
+var done = arguments[arguments.length - 1];
+function seconds(ms) { return Math.round(ms) / 1000; }
+function observed(type) {
+    var supported = window.PerformanceObserver && (PerformanceObserver.supportedEntryTypes || []).indexOf(type) !== -1;
+    if (!supported) { return Promise.resolve(null); }
+    return new Promise(function (resolve) {
+        var entries = [];
+        var observer = new PerformanceObserver(function (list) { entries = entries.concat(list.getEntries()); });
+        observer.observe({type: type, buffered: true});
+        setTimeout(function () {
+            entries = entries.concat(observer.takeRecords());
+            observer.disconnect();
+            resolve(entries);
+        }, 50);
+    });
+}
+function loaded(resolve) {
+    var nav = performance.getEntriesByType('navigation')[0];
+    if (nav ? nav.loadEventEnd > 0 : document.readyState === 'complete') { resolve(nav || null); }
+    else { setTimeout(function () { loaded(resolve); }, 50); }
+}
+Promise.all([new Promise(loaded), observed('largest-contentful-paint'), observed('layout-shift')]).then(function (results) {
+    var nav = results[0], lcp = results[1], shifts = results[2];
+    var navigation = {};
+    if (nav) {
+        navigation = {
+            redirect: seconds(nav.redirectEnd - nav.redirectStart),
+            dns: seconds(nav.domainLookupEnd - nav.domainLookupStart),
+            connect: seconds(nav.connectEnd - nav.connectStart),
+            tls: nav.secureConnectionStart > 0 ? seconds(nav.connectEnd - nav.secureConnectionStart) : 0,
+            time_to_first_byte: seconds(nav.responseStart - nav.startTime),
+            response: seconds(nav.responseEnd - nav.responseStart),
+            dom_interactive: seconds(nav.domInteractive - nav.startTime),
+            dom_content_loaded: seconds(nav.domContentLoadedEventEnd - nav.startTime),
+            page_load_time: seconds(nav.loadEventEnd - nav.startTime),
+            transfer_bytes: nav.transferSize || 0
+        };
+    }
+    var paint = {};
+    performance.getEntriesByType('paint').forEach(function (entry) {
+        paint[entry.name.replace(/-/g, '_')] = seconds(entry.startTime);
+    });
+    if (lcp && lcp.length) { paint.largest_contentful_paint = seconds(lcp[lcp.length - 1].startTime); }
+    if (shifts) {
+        paint.cumulative_layout_shift = Math.round(shifts.reduce(function (total, entry) {
+            return entry.hadRecentInput ? total : total + entry.value;
+        }, 0) * 1000) / 1000;
+    }
+    var entries = performance.getEntriesByType('resource');
+    var byType = {};
+    entries.forEach(function (entry) {
+        var bucket = byType[entry.initiatorType] = byType[entry.initiatorType] || {count: 0, transfer_bytes: 0};
+        bucket.count += 1;
+        bucket.transfer_bytes += entry.transferSize || 0;
+    });
+    var slowest = entries.slice().sort(function (a, b) { return b.duration - a.duration; }).slice(0, 5)
+        .map(function (entry) {
+            return {
+                url: entry.name,
+                type: entry.initiatorType,
+                duration: seconds(entry.duration),
+                transfer_bytes: entry.transferSize || 0
+            };
+        });
+    done({
+        navigation: navigation,
+        paint: paint,
+        resources: {
+            count: entries.length,
+            transfer_bytes: entries.reduce(function (total, entry) { return total + (entry.transferSize || 0); }, 0),
+            by_type: byType,
+            slowest: slowest
+        }
+    });
+});
+"""
+
+def collect_page_metrics(driver, url=None):
+    """Load url (if given) and return the browser's timing breakdown for the current page"""
+    if url:
+        driver.get(url)
+    # The script waits for the load event, so allow it a full page load; restore the
+    # previous limit afterwards so pooled sessions do not carry it into later tests
+    previous = driver.timeouts.script
+    driver.set_script_timeout(Config.PAGE_LOAD_TIMEOUT)
+    try:
+        metrics = driver.execute_async_script(METRICS_JS)
+    finally:
+        driver.set_script_timeout(previous)
+    metrics['url'] = driver.current_url
+    return metrics
+
+def threshold_violations(metrics, thresholds):
+    """List the navigation/paint metrics above their threshold; metrics the browser lacks are skipped"""
+    values = {**metrics['navigation'], **metrics['paint']}
+    violations = []
+    for name, limit in thresholds.items():
+        value = values.get(name)
+        if value is not None and value > limit:
+            violations.append(f"{name} {value} exceeds {limit}")
+    return violations
+
+def report_extras(metrics):
+    """pytest-html extras: a timing table plus the raw metrics as JSON"""
+    rows = [(name, value) for section in ('navigation', 'paint') for name, value in metrics[section].items()]
+    rows.append(('resource_count', metrics['resources']['count']))
+    rows.append(('resource_transfer_bytes', metrics['resources']['transfer_bytes']))
+    table = ''.join(f"<tr><td>{html.escape(name)}</td><td>{value}</td></tr>" for name, value in rows)
+    return [
+        extras.html(f"<table><tr><th>Metric</th><th>Value</th></tr>{table}</table>"),
+        extras.json(metrics, name="Page metrics"),
+    ]
@@ -0,0 +1,173 @@
+"""
+Performance history across runs, with median/MAD regression detection
+"""
+import html
+import os
+import sqlite3
+import statistics
+import time
+from config.config import Config
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS samples (
+    run_id TEXT NOT NULL,
+    recorded_at REAL NOT NULL,
+    subject TEXT NOT NULL,
+    metric TEXT NOT NULL,
+    value REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS samples_series ON samples (subject, metric, recorded_at);
+CREATE INDEX IF NOT EXISTS samples_run ON samples (run_id);
+"""
+
+# Scale factor that makes the MAD a consistent estimator of the standard deviation
+MAD_SCALE = 1.4826
+
+# Smallest increase worth flagging, by metric suffix; anything else is a time in seconds.
+# Without a floor, series that sit at 0 (dns, connect, tls, redirect) flag on any jitter.
+MIN_ABSOLUTE_CHANGE = {
+    '_bytes': 10240,
+    '_count': 1,
+    'cumulative_layout_shift': 0.02,
+}
+MIN_ABSOLUTE_SECONDS = 0.05
+
+def min_absolute_change(metric):
+    """Smallest increase of metric that can count as a regression"""
+    for suffix, floor in MIN_ABSOLUTE_CHANGE.items():
+        if metric.endswith(suffix):
+            return floor
+    return MIN_ABSOLUTE_SECONDS
+
+def page_subject(url):
+    """Stable series name for a page: its path under Config.BASE_URL.
+    
+    The mirror server listens on a new port every session, so absolute URLs would start a
+    new series each run. Mirror runs get their own 'mirror:' series; they are not comparable
+    with timings against the live site.
+    """
+    base = Config.BASE_URL.rstrip('/')
+    if not url.startswith(base + '/') and url != base:
+        return url
+    path = url[len(base):] or '/'
+    return f'mirror:{path}' if Config.MIRROR_DIR else path
+
+class PerfHistory:
+    """SQLite file of (run, subject, metric, value) samples; every metric is lower-is-better"""
+    
+    def __init__(self, path=None):
+        self.path = path or Config.PERF_HISTORY_DB
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # Parallel shards write to the same file, so wait on each other's locks
+        self.conn = sqlite3.connect(self.path, timeout=30)
+        self.conn.executescript(SCHEMA)
+    
+    def record(self, run_id, subject, values):
+        """Store {metric: value} for one subject (a page URL or a test node id)"""
+        now = time.time()
+        rows = [(run_id, now, subject, metric, float(value))
+                for metric, value in values.items() if value is not None]
+        with self.conn:
+            self.conn.executemany(
+                "INSERT INTO samples (run_id, recorded_at, subject, metric, value) VALUES (?, ?, ?, ?, ?)",
+                rows
+            )
+    
+    def record_page_metrics(self, run_id, metrics):
+        """Store the load timings, paint metrics and resource totals from collect_page_metrics"""
+        values = {**metrics['navigation'], **metrics['paint']}
+        values.pop('transfer_bytes', None)
+        values['document_bytes'] = metrics['navigation'].get('transfer_bytes')
+        values['resource_count'] = metrics['resources']['count']
+        values['resource_bytes'] = metrics['resources']['transfer_bytes']
+        for kind, bucket in metrics['resources']['by_type'].items():
+            values[f'{kind}_count'] = bucket['count']
+            values[f'{kind}_bytes'] = bucket['transfer_bytes']
+        self.record(run_id, page_subject(metrics['url']), values)
+    
+    def record_test_durations(self, run_id, results):
+        """Store the per-test durations collected by conftest"""
+        for nodeid, result in results.items():
+            if result['outcome'] == 'passed':
+                self.record(run_id, nodeid, {'duration': result['duration']})
+    
+    def _baseline(self, run_id, subject, metric, window):
+        """The last `window` values of a series, excluding the run under test"""
+        rows = self.conn.execute(
+            "SELECT value FROM samples WHERE subject = ? AND metric = ? AND run_id != ? "
+            "ORDER BY recorded_at DESC LIMIT ?",
+            (subject, metric, run_id, window)
+        ).fetchall()
+        return [value for (value,) in rows]
+    
+    def compare(self, run_id, window=None, min_samples=None, threshold=None, min_change=None):
+        """Compare every metric of a run with its rolling baseline.
+        
+        A value is a regression when its robust z-score, (value - median) / (1.4826 * MAD),
+        exceeds threshold, it is at least min_change (a fraction) above the median, and the
+        increase is at least min_absolute_change(metric). Series with fewer than min_samples
+        earlier values are reported but never flagged.
+        """
+        window = window or Config.PERF_BASELINE_WINDOW
+        min_samples = min_samples or Config.PERF_MIN_SAMPLES
+        threshold = threshold or Config.PERF_REGRESSION_Z
+        min_change = Config.PERF_MIN_CHANGE if min_change is None else min_change
+        
+        current = self.conn.execute(
+            "SELECT subject, metric, AVG(value) FROM samples WHERE run_id = ? "
+            "GROUP BY subject, metric ORDER BY subject, metric",
+            (run_id,)
+        ).fetchall()
+        
+        rows = []
+        for subject, metric, value in current:
+            baseline = self._baseline(run_id, subject, metric, window)
+            row = {'subject': subject, 'metric': metric, 'value': value, 'samples': len(baseline),
+                   'median': None, 'change': None, 'z': None, 'regression': False}
+            if baseline:
+                median = statistics.median(baseline)
+                mad = statistics.median(abs(v - median) for v in baseline) * MAD_SCALE
+                row['median'] = median
+                row['change'] = (value - median) / median if median else None
+                if mad:
+                    row['z'] = (value - median) / mad
+                elif value != median:
+                    # A perfectly flat baseline: any move is infinitely many MADs away
+                    row['z'] = float('inf') if value > median else float('-inf')
+                row['regression'] = (
+                    len(baseline) >= min_samples
+                    and row['z'] is not None and row['z'] > threshold
+                    and value > median * (1 + min_change)
+                    and value - median >= min_absolute_change(metric)
+                )
+            rows.append(row)
+        return rows
+    
+    def close(self):
+        """Close the database connection"""
+        self.conn.close()
+
+def trend_table_html(rows):
+    """Render compare() rows as an HTML table, regressions first"""
+    if not rows:
+        return "<p>No performance history recorded for this run.</p>"
+    
+    def cell(value, fmt):
+        return '' if value is None else fmt.format(value)
+    
+    body = "\n".join(
+        f"<tr style='{'color: red; font-weight: bold' if r['regression'] else ''}'>"
+        f"<td>{html.escape(r['subject'])}</td><td>{html.escape(r['metric'])}</td>"
+        f"<td>{cell(r['value'], '{:.3f}')}</td><td>{cell(r['median'], '{:.3f}')}</td>"
+        f"<td>{cell(r['change'], '{:+.1%}')}</td><td>{cell(r['z'], '{:.1f}')}</td>"
+        f"<td>{r['samples']}</td><td>{'REGRESSION' if r['regression'] else ''}</td></tr>"
+        for r in sorted(rows, key=lambda r: not r['regression'])
+    )
+    return (
+        "<h2>Performance trend</h2>"
+        "<table><tr><th>Subject</th><th>Metric</th><th>This run</th><th>Baseline median</th>"
+        "<th>Change</th><th>Robust z</th><th>Baseline runs</th><th></th></tr>\n"
+        f"{body}\n</table>"
+    )
@@ -0,0 +1,277 @@
+"""
+Offline mirror of the target site: capture it to a directory and serve it locally
+
+    python -m utils.site_mirror capture [--url URL] [--out DIR] [--max-pages N]
+    python -m utils.site_mirror serve [--dir DIR] [--port PORT]
+
+Run the suite against a capture with MIRROR_DIR=<dir>; conftest starts the server and
+points Config.BASE_URL at it. BASE_URL=<url> targets any other server.
+"""
+import argparse
+import json
+import os
+import re
+import threading
+import time
+from collections import deque
+from functools import partial
+from html.parser import HTMLParser
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urldefrag, urljoin, urlparse
+import requests
+from config.config import Config
+
+# Captured assets from other hosts (CDNs, font services) live under this prefix
+EXTERNAL_PREFIX = '_hosts'
+MANIFEST = 'manifest.json'
+
+# Attributes that reference sub-resources, per tag; <a href> is followed as a page instead
+ASSET_ATTRIBUTES = {
+    'link': ('href',),
+    'script': ('src',),
+    'img': ('src', 'srcset', 'data-src'),
+    'source': ('src', 'srcset'),
+    'video': ('src', 'poster'),
+    'audio': ('src',),
+    'iframe': ('src',),
+}
+# <link rel=...> values whose href is a sub-resource worth capturing
+LINK_RELS = {'stylesheet', 'icon', 'apple-touch-icon', 'preload', 'modulepreload', 'prefetch', 'manifest'}
+CSS_URL = re.compile(r"""url\(\s*['"]?([^'")]+)['"]?\s*\)|@import\s+['"]([^'"]+)['"]""")
+# Root-relative asset paths quoted inside scripts (lazily loaded chunks, images)
+SCRIPT_PATH = re.compile(r"""["'](/[\w\-./]+\.(?:js|css|json|png|jpe?g|gif|svg|webp|avif|ico|woff2?|ttf))["']""")
+
+class _LinkParser(HTMLParser):
+    """Collect page links and asset references from one HTML document"""
+    
+    def __init__(self):
+        super().__init__()
+        self.pages = []
+        self.assets = []
+        self.inline_css = []
+        self._in_style = False
+    
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        if tag == 'a' and attrs.get('href'):
+            self.pages.append(attrs['href'])
+        if tag == 'link' and not LINK_RELS & set((attrs.get('rel') or '').lower().split()):
+            return
+        for attribute in ASSET_ATTRIBUTES.get(tag, ()):
+            value = attrs.get(attribute)
+            if not value:
+                continue
+            if attribute == 'srcset':
+                self.assets.extend(part.split()[0] for part in value.split(',') if part.strip())
+            else:
+                self.assets.append(value)
+        if attrs.get('style'):
+            self.inline_css.append(attrs['style'])
+        if tag == 'style':
+            self._in_style = True
+    
+    def handle_endtag(self, tag):
+        if tag == 'style':
+            self._in_style = False
+    
+    def handle_data(self, data):
+        if self._in_style:
+            self.inline_css.append(data)
+
+class SiteMirror:
+    """Breadth-first capture of one site's pages plus every asset they reference"""
+    
+    def __init__(self, start_url, out_dir, max_pages=50):
+        self.start_url = start_url
+        self.host = urlparse(start_url).netloc
+        self.out_dir = out_dir
+        self.max_pages = max_pages
+        self.session = requests.Session()
+        self.session.headers['User-Agent'] = 'Mozilla/5.0 (site mirror)'
+        self.files = {}
+        self.hosts = {self.host}
+    
+    def local_path(self, url, is_html=False):
+        """Map a URL to its path inside the mirror (queries are dropped; the server ignores them too)"""
+        parsed = urlparse(url)
+        path = parsed.path or '/'
+        if parsed.netloc != self.host:
+            path = f'/{EXTERNAL_PREFIX}/{parsed.netloc}{path}'
+        if path.endswith('/'):
+            path += 'index.html'
+        elif is_html and not os.path.splitext(path)[1]:
+            path += '/index.html'
+        return os.path.join(self.out_dir, *path.lstrip('/').split('/'))
+    
+    def _fetch(self, url):
+        """GET a URL, returning None for failures so one broken asset does not stop the capture"""
+        try:
+            response = self.session.get(url, timeout=Config.LINK_CHECK_TIMEOUT)
+        except requests.RequestException as e:
+            print(f"  failed {url}: {e}")
+            return None
+        if response.status_code >= 400:
+            print(f"  {response.status_code} {url}")
+            return None
+        return response
+    
+    def _references(self, base, refs):
+        """Absolute http(s) URLs for a list of references, fragments removed"""
+        urls = []
+        for ref in refs:
+            ref = ref.strip()
+            if ref.startswith(('data:', 'blob:', 'javascript:', 'mailto:', 'tel:', '#')):
+                continue
+            url = urldefrag(urljoin(base, ref))[0]
+            if urlparse(url).scheme in ('http', 'https'):
+                urls.append(url)
+        return urls
+    
+    def _css_references(self, base, css):
+        return self._references(base, [a or b for a, b in CSS_URL.findall(css)])
+    
+    def capture(self):
+        """Capture pages up to max_pages, then rewrite absolute URLs to point into the mirror"""
+        pages = deque([self.start_url])
+        assets = deque()
+        seen = {self.start_url}
+        fetched = set()
+        page_count = 0
+        
+        def enqueue(queue, urls):
+            for url in urls:
+                if url not in seen:
+                    seen.add(url)
+                    queue.append(url)
+        
+        while (pages and page_count < self.max_pages) or assets:
+            if pages and page_count < self.max_pages:
+                url = pages.popleft()
+            else:
+                url = assets.popleft()
+            response = self._fetch(url)
+            if response is None:
+                continue
+            # Redirects (/about -> /about/) can land on a URL already captured under another name
+            final_url = urldefrag(response.url)[0]
+            if final_url in fetched:
+                continue
+            fetched.add(final_url)
+            seen.add(final_url)
+            content_type = response.headers.get('Content-Type', '').split(';')[0].strip()
+            
+            if content_type == 'text/html' and urlparse(final_url).netloc == self.host:
+                page_count += 1
+                print(f"page  {final_url}")
+                parser = _LinkParser()
+                parser.feed(response.text)
+                enqueue(pages, [u for u in self._references(final_url, parser.pages)
+                                if urlparse(u).netloc == self.host])
+                enqueue(assets, self._references(final_url, parser.assets))
+                for css in parser.inline_css:
+                    enqueue(assets, self._css_references(final_url, css))
+                path = self.local_path(final_url, is_html=True)
+            else:
+                path = self.local_path(final_url)
+                if content_type == 'text/css':
+                    enqueue(assets, self._css_references(final_url, response.text))
+                elif 'javascript' in content_type:
+                    enqueue(assets, self._references(final_url, SCRIPT_PATH.findall(response.text)))
+                self.hosts.add(urlparse(final_url).netloc)
+            
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, 'wb') as f:
+                f.write(response.content)
+            self.files[os.path.relpath(path, self.out_dir)] = {'url': final_url, 'content_type': content_type}
+        
+        self._rewrite()
+        with open(os.path.join(self.out_dir, MANIFEST), 'w') as f:
+            json.dump({
+                'start_url': self.start_url,
+                'captured_at': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+                'files': self.files,
+            }, f, indent=2, sort_keys=True)
+        # Count files rather than fetches: /about and /about/ served without a redirect share one file
+        pages_saved = sum(1 for info in self.files.values()
+                          if info['content_type'] == 'text/html' and urlparse(info['url']).netloc == self.host)
+        print(f"Captured {pages_saved} pages and {len(self.files) - pages_saved} assets into {self.out_dir}")
+    
+    def _rewrite(self):
+        """Point absolute URLs of captured hosts at the mirror so the browser never leaves it"""
+        replacements = []
+        for host in sorted(self.hosts, key=len, reverse=True):
+            target = '/' if host == self.host else f'/{EXTERNAL_PREFIX}/{host}/'
+            for prefix in (f'https://{host}/', f'http://{host}/', f'//{host}/'):
+                replacements.append((prefix, target))
+        for relpath, info in self.files.items():
+            if info['content_type'] not in ('text/html', 'text/css') and 'javascript' not in info['content_type']:
+                continue
+            path = os.path.join(self.out_dir, relpath)
+            with open(path, encoding='utf-8', errors='surrogateescape') as f:
+                text = f.read()
+            for prefix, target in replacements:
+                text = text.replace(prefix, target)
+            with open(path, 'w', encoding='utf-8', errors='surrogateescape') as f:
+                f.write(text)
+
+class MirrorRequestHandler(SimpleHTTPRequestHandler):
+    """Static handler that never lets the browser cache and stays quiet.
+    
+    Directories are left to SimpleHTTPRequestHandler: /about answers 301 to /about/, which
+    serves about/index.html, so relative links resolve as they do on a trailing-slash site.
+    """
+    
+    def end_headers(self):
+        self.send_header('Cache-Control', 'no-store')
+        super().end_headers()
+    
+    def log_message(self, format, *args):
+        pass
+
+class MirrorServer:
+    """Serve a captured mirror from a background thread"""
+    
+    def __init__(self, directory, host='127.0.0.1', port=0):
+        if not os.path.exists(os.path.join(directory, MANIFEST)):
+            raise FileNotFoundError(f"{directory} is not a site capture (no {MANIFEST})")
+        handler = partial(MirrorRequestHandler, directory=directory)
+        self.httpd = ThreadingHTTPServer((host, port), handler)
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+    
+    @property
+    def url(self):
+        host, port = self.httpd.server_address[:2]
+        return f'http://{host}:{port}/'
+    
+    def start(self):
+        self.thread.start()
+        return self
+    
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+def main():
+    parser = argparse.ArgumentParser(description="Capture the target site or serve a capture")
+    commands = parser.add_subparsers(dest='command', required=True)
+    capture = commands.add_parser('capture', help="Snapshot pages and assets into a directory")
+    capture.add_argument('--url', default=Config.BASE_URL)
+    capture.add_argument('--out', default=Config.MIRROR_DEFAULT_DIR)
+    capture.add_argument('--max-pages', type=int, default=50)
+    serve = commands.add_parser('serve', help="Serve a capture over HTTP")
+    serve.add_argument('--dir', default=Config.MIRROR_DEFAULT_DIR)
+    serve.add_argument('--port', type=int, default=8000)
+    args = parser.parse_args()
+    
+    if args.command == 'capture':
+        SiteMirror(args.url, args.out, args.max_pages).capture()
+    else:
+        server = MirrorServer(args.dir, port=args.port)
+        print(f"Serving {args.dir} at {server.url} (Ctrl+C to stop)")
+        try:
+            server.httpd.serve_forever()
+        except KeyboardInterrupt:
+            server.stop()
+
+if __name__ == '__main__':
+    main()
@@ -47,4 +47,9 @@ class TestData:
     PERFORMANCE_THRESHOLDS = {
         "page_load_time": 5.0,  # seconds
         "element_load_time": 3.0,  # seconds
+        "time_to_first_byte": 1.8,  # seconds
+        "dom_content_loaded": 4.0,  # seconds
+        "first_contentful_paint": 3.0,  # seconds
+        "largest_contentful_paint": 4.0,  # seconds
+        "cumulative_layout_shift": 0.25,  # unitless
     }
\ No newline at end of file
@@ -0,0 +1,25 @@
+"""
+Air quality from OpenWeather's /air_pollution endpoint
+"""
+# OpenWeather's 1-5 air quality index
+AQI_LABELS = {
+    1: 'Good',
+    2: 'Fair',
+    3: 'Moderate',
+    4: 'Poor',
+    5: 'Very Poor',
+}
+
+
+def parse_air_quality(payload):
+    """Reduce an /air_pollution payload to {'aqi', 'label', 'components'}, or None"""
+    try:
+        current = payload['list'][0]
+        aqi = current['main']['aqi']
+    except (KeyError, IndexError, TypeError):
+        return None
+    return {
+        'aqi': aqi,
+        'label': AQI_LABELS.get(aqi, 'Unknown'),
+        'components': current.get('components', {}),
+    }
@@ -0,0 +1,171 @@
+"""
+Static asset pipeline: vendoring, fingerprinting and pre-compression
+
+Usage:
+    python -m weather.assets vendor   # refresh the committed third-party CSS in static/
+    python -m weather.assets build    # write fingerprinted copies to static/dist/ (run on deploy)
+"""
+import gzip
+import hashlib
+import json
+import logging
+import mimetypes
+import os
+import sys
+
+from flask import request, send_from_directory, url_for
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+logger = logging.getLogger('weather.assets')
+
+STATIC_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'static')
+DIST_DIR = os.path.join(STATIC_DIR, 'dist')
+MANIFEST_NAME = 'manifest.json'
+
+# Logical asset name -> (upstream URL, sha256 of its bytes). The copies committed under static/
+# are the unmodified upstream files, so 'vendor' reproduces them byte for byte.
+VENDOR_ASSETS = {
+    'css/bulma.css': (
+        'https://cdnjs.cloudflare.com/ajax/libs/bulma/0.6.0/css/bulma.css',
+        'd10a6d0376657f946475ae1304430786f672594776f4212f19b5c6f8fd013d8a',
+    ),
+}
+
+COMPRESSIBLE_EXTENSIONS = ('.css', '.js', '.svg', '.json', '.html')
+IMMUTABLE_MAX_AGE = 31536000
+
+
+def vendor_assets():
+    """Download every entry of VENDOR_ASSETS into static/, refusing bytes that differ from the pin"""
+    import requests
+
+    for name, (url, sha256) in VENDOR_ASSETS.items():
+        response = requests.get(url, timeout=30)
+        response.raise_for_status()
+        digest = hashlib.sha256(response.content).hexdigest()
+        if digest != sha256:
+            raise RuntimeError(f"{url} has sha256 {digest}, expected {sha256}; update VENDOR_ASSETS "
+                               "deliberately if the upstream file is meant to change")
+        target = os.path.join(STATIC_DIR, name)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        with open(target, 'wb') as f:
+            f.write(response.content)
+        print(f"Vendored {url} -> {target}")
+
+
+def _source_files():
+    """Yield logical names of every asset under static/ except the build output"""
+    for root, dirs, files in os.walk(STATIC_DIR):
+        if os.path.abspath(root).startswith(DIST_DIR):
+            continue
+        for filename in files:
+            path = os.path.join(root, filename)
+            yield os.path.relpath(path, STATIC_DIR).replace(os.sep, '/')
+
+
+def build_assets():
+    """Fingerprint and pre-compress static assets, returning the manifest"""
+    manifest = {}
+    for name in _source_files():
+        with open(os.path.join(STATIC_DIR, name), 'rb') as f:
+            content = f.read()
+
+        digest = hashlib.sha256(content).hexdigest()[:12]
+        stem, ext = os.path.splitext(name)
+        hashed_name = f"{stem}.{digest}{ext}"
+        target = os.path.join(DIST_DIR, hashed_name)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+
+        with open(target, 'wb') as f:
+            f.write(content)
+        if ext in COMPRESSIBLE_EXTENSIONS:
+            with open(target + '.gz', 'wb') as f:
+                f.write(gzip.compress(content, compresslevel=9))
+            if brotli is not None:
+                with open(target + '.br', 'wb') as f:
+                    f.write(brotli.compress(content, quality=11))
+
+        manifest[name] = hashed_name
+
+    os.makedirs(DIST_DIR, exist_ok=True)
+    with open(os.path.join(DIST_DIR, MANIFEST_NAME), 'w', encoding='UTF-8') as f:
+        json.dump(manifest, f, indent=4, sort_keys=True)
+    return manifest
+
+
+def load_manifest():
+    """Read the build manifest; None if it is missing or older than any source asset"""
+    path = os.path.join(DIST_DIR, MANIFEST_NAME)
+    try:
+        built_at = os.path.getmtime(path)
+        with open(path, encoding='UTF-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    for name in _source_files():
+        if name not in manifest or os.path.getmtime(os.path.join(STATIC_DIR, name)) > built_at:
+            return None
+    return manifest
+
+
+def init_assets(app):
+    """Register the asset route and the asset_url template helper.
+
+    Never builds: build output is written only by `python -m weather.assets build`. Without an
+    up-to-date manifest, production refuses to start and other profiles serve the unhashed files.
+    """
+    manifest = load_manifest()
+    if manifest is None:
+        message = 'Asset manifest is missing or stale; run "python -m weather.assets build"'
+        if not (app.debug or app.testing):
+            raise RuntimeError(message)
+        logger.warning(message + '; serving unfingerprinted files from static/')
+        manifest = {}
+
+    def asset_url(name):
+        """Return the fingerprinted URL of an asset, or its plain static URL if not built"""
+        hashed_name = manifest.get(name)
+        if hashed_name is None:
+            return url_for('static', filename=name)
+        return url_for('serve_asset', filename=hashed_name)
+
+    @app.route('/assets/<path:filename>')
+    def serve_asset(filename):
+        encodings = request.accept_encodings
+        chosen = None
+        for encoding, suffix in (('br', '.br'), ('gzip', '.gz')):
+            if encodings[encoding] and os.path.exists(os.path.join(DIST_DIR, filename + suffix)):
+                chosen = (encoding, suffix)
+                break
+
+        if chosen is None:
+            response = send_from_directory(DIST_DIR, filename, max_age=IMMUTABLE_MAX_AGE)
+        else:
+            encoding, suffix = chosen
+            response = send_from_directory(DIST_DIR, filename + suffix, max_age=IMMUTABLE_MAX_AGE)
+            # Keep the original type rather than application/gzip
+            response.mimetype = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+            response.headers['Content-Encoding'] = encoding
+        response.headers['Cache-Control'] = f'public, max-age={IMMUTABLE_MAX_AGE}, immutable'
+        response.headers['Vary'] = 'Accept-Encoding'
+        return response
+
+    app.jinja_env.globals['asset_url'] = asset_url
+    app.extensions['asset_manifest'] = manifest
+
+
+if __name__ == '__main__':
+    commands = sys.argv[1:] or ['build']
+    for command in commands:
+        if command == 'vendor':
+            vendor_assets()
+        elif command == 'build':
+            for name, hashed_name in build_assets().items():
+                print(f"{name} -> dist/{hashed_name}")
+        else:
+            sys.exit(f"Unknown command: {command}")
@@ -0,0 +1,234 @@
+"""
+Cache backends for upstream weather responses
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+
+def cache_key(endpoint, city):
+    """Return the cache key of an upstream endpoint's payload for a city"""
+    return f'{endpoint}:{city.strip().lower()}'
+
+
+class MemoryCache:
+    """Per-process cache, cold in every worker"""
+
+    def __init__(self):
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """Return the cached value for key, or None if missing or expired"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if expires_at < time.time():
+            return None
+        return value
+
+    def peek(self, key):
+        """Return (value, expires_at) for key even if expired, or None"""
+        return self._entries.get(key)
+
+    def set(self, key, value, ttl):
+        """Store value under key for ttl seconds"""
+        with self._lock:
+            self._entries[key] = (value, time.time() + ttl)
+
+    def claim(self, key, ttl):
+        """Atomically set key for ttl seconds unless it holds a live entry; True if set"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] >= time.time():
+                return False
+            self._entries[key] = (True, time.time() + ttl)
+            return True
+
+    def delete(self, key):
+        """Drop key from the cache"""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        """Drop every entry"""
+        with self._lock:
+            self._entries.clear()
+
+
+class SQLiteCache:
+    """Cache shared by every worker process through a local SQLite file"""
+
+    SCHEMA = (
+        'CREATE TABLE IF NOT EXISTS cache ('
+        'key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)'
+    )
+    # Expired rows stay this long for peek() (warmup, known coordinates), then a write purges them
+    PURGE_AFTER = 3600
+
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+        self._last_purge = 0.0
+
+    def _connection(self):
+        """Return a connection owned by the current thread and process"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            # WAL lets readers proceed while another worker is writing
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.execute(self.SCHEMA)
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def get(self, key):
+        """Return the cached value for key, or None if missing or expired"""
+        row = self._connection().execute(
+            'SELECT value FROM cache WHERE key = ? AND expires_at >= ?',
+            (key, time.time()),
+        ).fetchone()
+        if row is None:
+            return None
+        return json.loads(row[0])
+
+    def peek(self, key):
+        """Return (value, expires_at) for key even if expired, or None"""
+        row = self._connection().execute(
+            'SELECT value, expires_at FROM cache WHERE key = ?', (key,),
+        ).fetchone()
+        if row is None:
+            return None
+        return json.loads(row[0]), row[1]
+
+    def set(self, key, value, ttl):
+        """Store value under key for ttl seconds, purging long-expired rows at most hourly"""
+        now = time.time()
+        self._connection().execute(
+            'INSERT OR REPLACE INTO cache (key, value, expires_at) VALUES (?, ?, ?)',
+            (key, json.dumps(value), now + ttl),
+        )
+        if now - self._last_purge >= self.PURGE_AFTER:
+            self._last_purge = now
+            self.purge_expired(now - self.PURGE_AFTER)
+
+    def claim(self, key, ttl):
+        """Atomically set key for ttl seconds unless it holds a live entry; True if set
+
+        Every worker shares the file, so exactly one of them wins a claim.
+        """
+        now = time.time()
+        cursor = self._connection().execute(
+            'INSERT INTO cache (key, value, expires_at) VALUES (?, ?, ?) '
+            'ON CONFLICT (key) DO UPDATE SET value = excluded.value, expires_at = excluded.expires_at '
+            'WHERE cache.expires_at < ?',
+            (key, json.dumps(os.getpid()), now + ttl, now),
+        )
+        return cursor.rowcount == 1
+
+    def delete(self, key):
+        """Drop key from the cache"""
+        self._connection().execute('DELETE FROM cache WHERE key = ?', (key,))
+
+    def clear(self):
+        """Drop every entry"""
+        self._connection().execute('DELETE FROM cache')
+
+    def purge_expired(self, before=None):
+        """Remove rows that expired before `before` (default now) so the file does not grow without bound"""
+        if before is None:
+            before = time.time()
+        self._connection().execute('DELETE FROM cache WHERE expires_at < ?', (before,))
+
+
+class NullCache:
+    """Cache that never stores anything"""
+
+    def get(self, key):
+        return None
+
+    def peek(self, key):
+        return None
+
+    def set(self, key, value, ttl):
+        pass
+
+    def claim(self, key, ttl):
+        return True
+
+    def delete(self, key):
+        pass
+
+    def clear(self):
+        pass
+
+
+class NegativeCache:
+    """Bounded, short-lived set of names the upstream reported as not found"""
+
+    def __init__(self, maxsize=1024, ttl=300):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def normalize(name):
+        return ' '.join(name.split()).casefold()
+
+    def __contains__(self, name):
+        key = self.normalize(name)
+        with self._lock:
+            expires_at = self._entries.get(key)
+            if expires_at is not None and expires_at >= time.time():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return True
+            if expires_at is not None:
+                del self._entries[key]
+            self.misses += 1
+            return False
+
+    def add(self, name):
+        """Remember name as invalid, evicting the least recently used entry when full"""
+        key = self.normalize(name)
+        with self._lock:
+            self._entries[key] = time.time() + self.ttl
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def stats(self):
+        """Return size and hit counters; every hit is an upstream call saved"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+            }
+
+
+def create_cache(config, root_path=''):
+    """Build the cache backend selected by WEATHER_CACHE_BACKEND.
+
+    A relative WEATHER_CACHE_PATH is resolved against root_path, so every worker shares one file
+    whatever its working directory.
+    """
+    backend = config.get('WEATHER_CACHE_BACKEND', 'memory')
+    if backend == 'memory':
+        return MemoryCache()
+    if backend == 'sqlite':
+        return SQLiteCache(os.path.join(root_path, config.get('WEATHER_CACHE_PATH', 'weather_cache.db')))
+    if backend == 'none':
+        return NullCache()
+    raise ValueError(f"Unsupported cache backend: {backend}")
@@ -0,0 +1,94 @@
+"""
+Record and replay of upstream OpenWeather traffic
+
+In 'record' mode every upstream call is appended to a JSONL cassette together with
+its latency. In 'replay' mode calls are answered from the cassette without network
+access, optionally sleeping for the recorded or a fixed synthetic latency.
+"""
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+
+# 'cod' of a replayed call that was never recorded; deliberately not '404', which the
+# app takes as a definite "city not found" and remembers in the negative cache
+CASSETTE_MISS = 'cassette-miss'
+
+
+def _match_key(endpoint, params):
+    return endpoint, json.dumps(params, sort_keys=True)
+
+
+class Cassette:
+    """A JSONL file of {endpoint, params, response, latency} interactions"""
+
+    def __init__(self, path, mode, latency='recorded'):
+        if mode not in ('record', 'replay'):
+            raise ValueError(f"Unsupported cassette mode: {mode}")
+        self.path = path
+        self.mode = mode
+        self.latency = latency
+        self._lock = threading.Lock()
+        self._interactions = defaultdict(list)
+        self._positions = defaultdict(int)
+        if mode == 'replay':
+            self._load()
+
+    def _load(self):
+        with open(self.path, encoding='UTF-8') as f:
+            for line in f:
+                if line.strip():
+                    entry = json.loads(line)
+                    key = _match_key(entry['endpoint'], entry['params'])
+                    self._interactions[key].append(entry)
+
+    def record(self, endpoint, params, response, latency):
+        """Append one interaction to the cassette"""
+        entry = {
+            'endpoint': endpoint,
+            'params': params,
+            'response': response,
+            'latency': round(latency, 6),
+            'recorded_at': time.time(),
+        }
+        line = json.dumps(entry) + '\n'
+        with self._lock:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(self.path, 'a', encoding='UTF-8') as f:
+                f.write(line)
+
+    def replay(self, endpoint, params):
+        """Return the next recorded response for this call, repeating the last one"""
+        key = _match_key(endpoint, params)
+        with self._lock:
+            entries = self._interactions.get(key)
+            if not entries:
+                entry = None
+            else:
+                position = self._positions[key]
+                entry = entries[min(position, len(entries) - 1)]
+                self._positions[key] = position + 1
+
+        if entry is None:
+            return {'cod': CASSETTE_MISS, 'message': f'not recorded in cassette: {endpoint} {key[1]}'}
+
+        if self.latency == 'recorded':
+            time.sleep(entry['latency'])
+        elif self.latency not in (None, 'none'):
+            time.sleep(float(self.latency))
+        return json.loads(json.dumps(entry['response']))
+
+
+def create_cassette(config, root_path=''):
+    """Build the cassette for WEATHER_UPSTREAM_MODE, or None in 'live' mode.
+
+    A relative WEATHER_CASSETTE is resolved against root_path, not the working directory.
+    """
+    mode = config.get('WEATHER_UPSTREAM_MODE', 'live')
+    if mode == 'live':
+        return None
+    path = os.path.join(root_path, config.get('WEATHER_CASSETTE', 'cassettes/upstream.jsonl'))
+    return Cassette(path, mode, config.get('WEATHER_REPLAY_LATENCY', 'recorded'))
@@ -0,0 +1,51 @@
+"""
+Response compression for HTML and JSON routes
+"""
+import gzip
+
+from flask import request
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+COMPRESSIBLE_MIMETYPES = ('text/html', 'application/json')
+MIN_SIZE = 500
+
+
+def _compress(data, encoding):
+    if encoding == 'br':
+        return brotli.compress(data, quality=5)
+    return gzip.compress(data, compresslevel=6)
+
+
+def init_compression(app):
+    """Compress dynamic HTML and JSON responses according to Accept-Encoding"""
+
+    @app.after_request
+    def compress_response(response):
+        if (response.status_code < 200 or response.status_code >= 300
+                or response.direct_passthrough
+                or response.mimetype not in COMPRESSIBLE_MIMETYPES
+                or 'Content-Encoding' in response.headers):
+            return response
+
+        response.vary.add('Accept-Encoding')
+        accepted = request.accept_encodings
+        if brotli is not None and accepted['br']:
+            encoding = 'br'
+        elif accepted['gzip']:
+            encoding = 'gzip'
+        else:
+            return response
+
+        data = response.get_data()
+        if len(data) < MIN_SIZE:
+            return response
+
+        response.set_data(_compress(data, encoding))
+        response.headers['Content-Encoding'] = encoding
+        return response
+
+    return compress_response
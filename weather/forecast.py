@@ -0,0 +1,141 @@
+"""
+Daily aggregation of OpenWeather 5-day / 3-hour forecasts
+"""
+import numpy as np
+
+SECONDS_PER_DAY = 86400
+SLOTS_PER_FORECAST = 40
+# 40 three-hour slots can touch six calendar days in the city's local time
+MAX_DAYS = 6
+
+# OpenWeather icon prefixes, in the order used as condition indices
+CONDITIONS = [
+    ('01', 'clear sky'),
+    ('02', 'few clouds'),
+    ('03', 'scattered clouds'),
+    ('04', 'broken clouds'),
+    ('09', 'shower rain'),
+    ('10', 'rain'),
+    ('11', 'thunderstorm'),
+    ('13', 'snow'),
+    ('50', 'mist'),
+]
+_CONDITION_INDEX = {prefix: i for i, (prefix, _) in enumerate(CONDITIONS)}
+
+
+def forecast_arrays(payloads):
+    """Pack forecast payloads into (cities, slots) arrays padded with NaN / -1"""
+    n = len(payloads)
+    counts = np.zeros(n, dtype=np.int64)
+    offsets = np.zeros(n, dtype=np.int64)
+
+    # One pass over every slot into flat lists; the arrays are filled once at the end
+    temps, times, conditions = [], [], []
+    condition_index = _CONDITION_INDEX
+    for row, payload in enumerate(payloads):
+        entries = payload.get('list', [])[:SLOTS_PER_FORECAST]
+        counts[row] = len(entries)
+        offsets[row] = payload.get('city', {}).get('timezone', 0)
+        for entry in entries:
+            temps.append(entry['main']['temp'])
+            times.append(entry['dt'])
+            conditions.append(condition_index.get(entry['weather'][0]['icon'][:2], -1))
+
+    # Slots are left-aligned, so the filled cells in row-major order match the flat lists
+    filled = np.arange(SLOTS_PER_FORECAST) < counts[:, None]
+    arrays = {
+        'temps': np.full((n, SLOTS_PER_FORECAST), np.nan),
+        'times': np.zeros((n, SLOTS_PER_FORECAST), dtype=np.int64),
+        'conditions': np.full((n, SLOTS_PER_FORECAST), -1, dtype=np.int64),
+        'offsets': offsets,
+    }
+    arrays['temps'][filled] = temps
+    arrays['times'][filled] = times
+    arrays['conditions'][filled] = conditions
+    return arrays
+
+
+def aggregate_daily(arrays):
+    """Reduce packed forecast arrays to per-city, per-day statistics"""
+    temps = arrays['temps']
+    conditions = arrays['conditions']
+    n = temps.shape[0]
+    valid = ~np.isnan(temps)
+
+    # Calendar day of each slot in the city's local time, relative to its first slot
+    local_days = (arrays['times'] + arrays['offsets'][:, None]) // SECONDS_PER_DAY
+    first_day = local_days[:, :1]
+    day_index = np.clip(local_days - first_day, 0, MAX_DAYS - 1)
+
+    # One group per (city, day); slots are time-ordered so groups come out contiguous
+    city_index = np.broadcast_to(np.arange(n)[:, None], temps.shape)
+    group = (city_index * MAX_DAYS + day_index)[valid]
+    values = temps[valid]
+    if np.any(group[1:] < group[:-1]):
+        order = np.argsort(group, kind='stable')
+        group, values = group[order], values[order]
+
+    size = n * MAX_DAYS
+    temp_min = np.full(size, np.nan)
+    temp_max = np.full(size, np.nan)
+    temp_mean = np.full(size, np.nan)
+    if group.size:
+        starts = np.flatnonzero(np.r_[True, group[1:] != group[:-1]])
+        keys = group[starts]
+        counts = np.diff(np.r_[starts, group.size])
+        temp_min[keys] = np.minimum.reduceat(values, starts)
+        temp_max[keys] = np.maximum.reduceat(values, starts)
+        temp_mean[keys] = np.add.reduceat(values, starts) / counts
+
+    # Histogram of (city, day, condition) triples; the argmax is the dominant condition,
+    # or -1 for days whose icons are all unknown (argmax of all zeros would say clear sky)
+    known = valid & (conditions >= 0)
+    n_conditions = len(CONDITIONS)
+    flat = (city_index * MAX_DAYS + day_index) * n_conditions + conditions
+    histogram = np.bincount(flat[known], minlength=size * n_conditions).reshape(n, MAX_DAYS, n_conditions)
+    dominant = np.where(histogram.any(axis=2), histogram.argmax(axis=2), -1)
+
+    shape = (n, MAX_DAYS)
+    return {
+        'days': first_day + np.arange(MAX_DAYS),
+        'has_data': ~np.isnan(temp_min).reshape(shape),
+        'temp_min': temp_min.reshape(shape),
+        'temp_max': temp_max.reshape(shape),
+        'temp_mean': temp_mean.reshape(shape),
+        'dominant': dominant,
+    }
+
+
+def daily_forecasts(payloads):
+    """Return one list of daily summaries per payload"""
+    if not payloads:
+        return []
+    daily = aggregate_daily(forecast_arrays(payloads))
+
+    # Convert to Python lists once; per-element NumPy indexing dominates otherwise
+    dates = np.datetime_as_string(daily['days'].astype('datetime64[D]')).tolist()
+    has_data = daily['has_data'].tolist()
+    temp_min = daily['temp_min'].tolist()
+    temp_max = daily['temp_max'].tolist()
+    temp_mean = daily['temp_mean'].tolist()
+    dominant = daily['dominant'].tolist()
+    labels = [(f'{prefix}d', description) for prefix, description in CONDITIONS]
+
+    results = []
+    for row in range(len(payloads)):
+        days = []
+        for col in range(MAX_DAYS):
+            if not has_data[row][col]:
+                continue
+            condition = dominant[row][col]
+            icon, description = labels[condition] if condition >= 0 else (None, None)
+            days.append({
+                'date': dates[row][col],
+                'temp_min': round(temp_min[row][col], 2),
+                'temp_max': round(temp_max[row][col], 2),
+                'temp_mean': round(temp_mean[row][col], 2),
+                'icon': icon,
+                'description': description,
+            })
+        results.append(days)
+    return results
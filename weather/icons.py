@@ -0,0 +1,96 @@
+"""
+Local proxy cache for OpenWeather condition icons
+
+Usage:
+    python -m weather.icons warm   # fetch every known icon into the cache directory
+"""
+import os
+import re
+import sys
+import tempfile
+import threading
+
+from flask import abort, send_file
+
+ICON_URL = 'http://openweathermap.org/img/w/{code}.png'
+ICON_CODES = [
+    f'{number}{period}'
+    for number in ('01', '02', '03', '04', '09', '10', '11', '13', '50')
+    for period in ('d', 'n')
+]
+ICON_CODE_PATTERN = re.compile(r'^\d{2}[dn]$')
+ICON_MAX_AGE = 30 * 24 * 3600
+DEFAULT_ICON_DIR = 'icon_cache'
+
+_fetch_locks = {code: threading.Lock() for code in ICON_CODES}
+
+
+def icon_path(icon_dir, code):
+    return os.path.join(icon_dir, f'{code}.png')
+
+
+def fetch_icon(icon_dir, code):
+    """Return the local path of an icon, downloading it on first use"""
+    import requests
+
+    path = icon_path(icon_dir, code)
+    if os.path.exists(path):
+        return path
+
+    with _fetch_locks.setdefault(code, threading.Lock()):
+        # Another thread may have fetched it while we waited
+        if os.path.exists(path):
+            return path
+
+        response = requests.get(ICON_URL.format(code=code), timeout=10)
+        response.raise_for_status()
+
+        os.makedirs(icon_dir, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=icon_dir, suffix='.tmp')
+        with os.fdopen(fd, 'wb') as f:
+            f.write(response.content)
+        os.replace(tmp_path, path)
+    return path
+
+
+def warm_icons(icon_dir):
+    """Fetch every known icon code, returning the codes that failed"""
+    import requests
+
+    failed = []
+    for code in ICON_CODES:
+        try:
+            fetch_icon(icon_dir, code)
+        except requests.RequestException:
+            failed.append(code)
+    return failed
+
+
+def init_icons(app):
+    """Register the /icons/<code>.png route"""
+    app.config.setdefault('WEATHER_ICON_DIR', DEFAULT_ICON_DIR)
+
+    @app.route('/icons/<code>.png')
+    def weather_icon(code):
+        import requests
+
+        if not ICON_CODE_PATTERN.match(code):
+            abort(404)
+        icon_dir = os.path.join(app.root_path, app.config['WEATHER_ICON_DIR'])
+        try:
+            path = fetch_icon(icon_dir, code)
+        except requests.RequestException:
+            abort(502)
+        # send_file sets the ETag and answers If-None-Match with a 304
+        return send_file(path, mimetype='image/png', etag=True, max_age=ICON_MAX_AGE,
+                         conditional=True)
+
+
+if __name__ == '__main__':
+    icon_dir = sys.argv[2] if len(sys.argv) > 2 else DEFAULT_ICON_DIR
+    if sys.argv[1:2] != ['warm']:
+        sys.exit('Usage: python -m weather.icons warm [icon_dir]')
+    failed = warm_icons(icon_dir)
+    print(f"Warmed {len(ICON_CODES) - len(failed)}/{len(ICON_CODES)} icons into {icon_dir}")
+    if failed:
+        print(f"Failed: {', '.join(failed)}")
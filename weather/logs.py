@@ -0,0 +1,86 @@
+"""
+Structured, non-blocking application logging
+
+Records are queued by a QueueHandler in the calling thread and formatted as JSON
+and written by a QueueListener thread, so request threads never block on log I/O.
+"""
+import atexit
+import itertools
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+import threading
+
+# Attributes every LogRecord has; anything else was passed through extra=
+_RECORD_ATTRIBUTES = set(vars(logging.LogRecord('', 0, '', 0, '', None, None))) | {'message', 'sampled'}
+
+
+class JsonFormatter(logging.Formatter):
+    """Format a record and its extra= fields as one JSON object per line"""
+
+    def format(self, record):
+        entry = {
+            'ts': self.formatTime(record, '%Y-%m-%dT%H:%M:%S'),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES:
+                entry[key] = value
+        if record.exc_info:
+            entry['exc_info'] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+class SamplingFilter(logging.Filter):
+    """Pass only one in every N records logged with extra={'sampled': True}"""
+
+    def __init__(self, every):
+        super().__init__()
+        self.every = max(1, every)
+        self._counter = itertools.count()
+        self._lock = threading.Lock()
+
+    def filter(self, record):
+        if not getattr(record, 'sampled', False):
+            return True
+        with self._lock:
+            return next(self._counter) % self.every == 0
+
+
+_listener = None
+
+
+def configure_logging(app):
+    """Route the 'weather' loggers through a queue to a JSON stream handler"""
+    global _listener
+    if _listener is not None:
+        return
+
+    output = logging.StreamHandler(sys.stdout)
+    output.setFormatter(JsonFormatter())
+
+    log_queue = queue.SimpleQueue()
+    # QueueHandler only merges args into the message; extra= payloads are serialised
+    # by JsonFormatter on the listener thread
+    handler = logging.handlers.QueueHandler(log_queue)
+    handler.addFilter(SamplingFilter(app.config.get('WEATHER_PAYLOAD_LOG_SAMPLE_EVERY', 100)))
+
+    logger = logging.getLogger('weather')
+    logger.setLevel(app.config.get('WEATHER_LOG_LEVEL', 'INFO'))
+    logger.propagate = False
+    logger.handlers[:] = [handler]
+
+    def start_listener():
+        global _listener
+        _listener = logging.handlers.QueueListener(log_queue, output, respect_handler_level=True)
+        _listener.start()
+
+    start_listener()
+    atexit.register(lambda: _listener.stop())
+    # The writer thread does not survive fork (gunicorn --preload); start a new one
+    os.register_at_fork(after_in_child=start_listener)
@@ -0,0 +1,156 @@
+"""
+On-demand request profiling with collapsed-stack output for flame graphs
+
+A request is profiled when it carries 'X-Profile: 1' (or '?profile=1') together with a
+valid 'X-Admin-Token', or when it is the Nth request and WEATHER_PROFILE_SAMPLE_EVERY is N.
+Render a dump with e.g. 'flamegraph.pl profiles/<id>.collapsed > profile.svg'.
+"""
+import hmac
+import itertools
+import json
+import os
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from datetime import datetime
+
+from flask import abort, g, jsonify, request, send_from_directory
+
+INDEX_NAME = 'index.jsonl'
+
+
+class StackSampler:
+    """Samples the call stack of one thread from a helper thread"""
+
+    def __init__(self, thread_id, interval=0.001):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='profile-sampler', daemon=True)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f'{os.path.basename(code.co_filename)}:{code.co_name}')
+                frame = frame.f_back
+            if stack:
+                self.stacks[';'.join(reversed(stack))] += 1
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Stop sampling and return the Counter of collapsed stacks"""
+        self._stop.set()
+        self._thread.join()
+        return self.stacks
+
+
+def is_admin(app):
+    """True if the request carries the configured admin token"""
+    token = app.config.get('WEATHER_ADMIN_TOKEN')
+    supplied = request.headers.get('X-Admin-Token', '')
+    # compare_digest rejects non-ASCII str, so compare bytes: WSGI header values are the raw
+    # bytes decoded as latin-1, and a non-ASCII token is configured as UTF-8 text
+    supplied = supplied.encode('latin-1', errors='replace')
+    return bool(token) and hmac.compare_digest(token.encode('utf-8'), supplied)
+
+
+def _new_profile_id():
+    return f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:8]}"
+
+
+def _write_profile(directory, profile_id, stacks, duration, status):
+    """Write the collapsed stacks of the current request and append it to the index"""
+    os.makedirs(directory, exist_ok=True)
+    with open(os.path.join(directory, f'{profile_id}.collapsed'), 'w', encoding='UTF-8') as f:
+        for stack, count in stacks.most_common():
+            f.write(f'{stack} {count}\n')
+
+    entry = {
+        'id': profile_id,
+        'method': request.method,
+        'path': request.full_path.rstrip('?'),
+        'status': status,
+        'duration_ms': round(duration * 1000, 2),
+        'samples': sum(stacks.values()),
+        'created_at': time.time(),
+    }
+    with open(os.path.join(directory, INDEX_NAME), 'a', encoding='UTF-8') as f:
+        f.write(json.dumps(entry) + '\n')
+    return entry
+
+
+def list_profiles(directory):
+    """Return the recorded profiles, newest first"""
+    try:
+        with open(os.path.join(directory, INDEX_NAME), encoding='UTF-8') as f:
+            entries = [json.loads(line) for line in f if line.strip()]
+    except FileNotFoundError:
+        return []
+    return list(reversed(entries))
+
+
+def init_profiling(app):
+    """Register the profiling hooks and the /admin/profiles endpoints"""
+    app.config.setdefault('WEATHER_PROFILE_DIR', 'profiles')
+    app.config.setdefault('WEATHER_PROFILE_SAMPLE_EVERY', 0)
+    app.config.setdefault('WEATHER_PROFILE_INTERVAL', 0.001)
+    request_counter = itertools.count(1)
+
+    def profile_dir():
+        return os.path.join(app.root_path, app.config['WEATHER_PROFILE_DIR'])
+
+    def wants_profile():
+        if request.path.startswith('/admin/profiles'):
+            return False
+        requested = request.headers.get('X-Profile') == '1' or request.args.get('profile') == '1'
+        if requested and is_admin(app):
+            return True
+        every = app.config['WEATHER_PROFILE_SAMPLE_EVERY']
+        return bool(every) and next(request_counter) % every == 0
+
+    @app.before_request
+    def start_profile():
+        if wants_profile():
+            g.profile_sampler = StackSampler(threading.get_ident(),
+                                             app.config['WEATHER_PROFILE_INTERVAL']).start()
+            g.profile_started = time.perf_counter()
+            g.profile_id = _new_profile_id()
+
+    @app.after_request
+    def tag_profile(response):
+        if 'profile_sampler' in g:
+            g.profile_status = response.status_code
+            response.headers['X-Profile-Id'] = g.profile_id
+        return response
+
+    # Teardown also runs when a view raises and after_request is skipped (e.g. in DEBUG),
+    # so the sampler thread is always stopped
+    @app.teardown_request
+    def stop_profile(error=None):
+        sampler = g.pop('profile_sampler', None)
+        if sampler is None:
+            return
+        stacks = sampler.stop()
+        duration = time.perf_counter() - g.pop('profile_started')
+        _write_profile(profile_dir(), g.pop('profile_id'), stacks, duration, g.pop('profile_status', 500))
+
+    @app.route('/admin/profiles')
+    def profiles_list():
+        if not is_admin(app):
+            abort(403)
+        return jsonify(list_profiles(profile_dir()))
+
+    @app.route('/admin/profiles/<profile_id>.collapsed')
+    def profile_download(profile_id):
+        if not is_admin(app):
+            abort(403)
+        return send_from_directory(profile_dir(), f'{profile_id}.collapsed', mimetype='text/plain')
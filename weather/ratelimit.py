@@ -0,0 +1,165 @@
+"""
+Token-bucket scheduling of upstream OpenWeather calls
+"""
+import heapq
+import itertools
+import os
+import sqlite3
+import threading
+import time
+
+PRIORITY_INTERACTIVE = 0
+PRIORITY_DEFAULT = 5
+PRIORITY_BACKGROUND = 10
+
+
+class QuotaTimeout(Exception):
+    """Raised when a call waited longer than allowed for an upstream token"""
+
+
+class LocalTokenStore:
+    """Token bucket held in process memory, shared by every thread"""
+
+    def __init__(self, rate_per_minute, capacity):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def try_take(self):
+        """Take one token; return 0 on success or the seconds until one is due"""
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return 0.0
+            return (1 - self.tokens) / self.rate
+
+
+class SQLiteTokenStore:
+    """Token bucket kept in a local SQLite file so every worker draws from it"""
+
+    def __init__(self, path, rate_per_minute, capacity, name='openweather'):
+        self.path = path
+        self.rate = rate_per_minute / 60.0
+        self.capacity = capacity
+        self.name = name
+        self._local = threading.local()
+
+    def _connection(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS quota ('
+                'name TEXT PRIMARY KEY, tokens REAL NOT NULL, updated REAL NOT NULL)'
+            )
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def try_take(self):
+        """Take one token; return 0 on success or the seconds until one is due"""
+        conn = self._connection()
+        now = time.time()
+        # IMMEDIATE takes the write lock up front so two workers cannot both spend a token
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            row = conn.execute('SELECT tokens, updated FROM quota WHERE name = ?',
+                               (self.name,)).fetchone()
+            tokens = self.capacity if row is None else row[0]
+            if row is not None:
+                tokens = min(self.capacity, tokens + max(0.0, now - row[1]) * self.rate)
+            wait = 0.0
+            if tokens >= 1:
+                tokens -= 1
+            else:
+                wait = (1 - tokens) / self.rate
+            conn.execute('INSERT OR REPLACE INTO quota (name, tokens, updated) VALUES (?, ?, ?)',
+                         (self.name, tokens, now))
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+        return wait
+
+
+class UpstreamScheduler:
+    """Hands out upstream tokens to waiting threads in priority order"""
+
+    def __init__(self, store):
+        self.store = store
+        self._waiters = []
+        self._sequence = itertools.count()
+        self._condition = threading.Condition()
+        self._granted = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+        self._timeouts = 0
+
+    def acquire(self, priority=PRIORITY_DEFAULT, timeout=None):
+        """Block until this caller may make one upstream call; return the time waited"""
+        started = time.monotonic()
+        deadline = None if timeout is None else started + timeout
+        ticket = (priority, next(self._sequence))
+
+        with self._condition:
+            heapq.heappush(self._waiters, ticket)
+            try:
+                while True:
+                    if self._waiters[0] == ticket:
+                        delay = self.store.try_take()
+                        if delay == 0:
+                            heapq.heappop(self._waiters)
+                            break
+                    else:
+                        # Not our turn; wake up when the head of the queue changes
+                        delay = None
+
+                    if deadline is not None:
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0:
+                            self._waiters.remove(ticket)
+                            heapq.heapify(self._waiters)
+                            self._timeouts += 1
+                            raise QuotaTimeout(f"No upstream token within {timeout}s")
+                        delay = remaining if delay is None else min(delay, remaining)
+                    self._condition.wait(delay)
+            finally:
+                self._condition.notify_all()
+
+            waited = time.monotonic() - started
+            self._granted += 1
+            self._total_wait += waited
+            self._max_wait = max(self._max_wait, waited)
+        return waited
+
+    def stats(self):
+        """Return queue depth and wait-time counters"""
+        with self._condition:
+            return {
+                'queue_depth': len(self._waiters),
+                'granted': self._granted,
+                'timeouts': self._timeouts,
+                'avg_wait': self._total_wait / self._granted if self._granted else 0.0,
+                'max_wait': self._max_wait,
+            }
+
+
+def create_scheduler(config, root_path=''):
+    """Build the scheduler selected by WEATHER_QUOTA_BACKEND; a relative path is resolved against root_path"""
+    rate = config.get('WEATHER_QUOTA_PER_MINUTE', 60)
+    capacity = config.get('WEATHER_QUOTA_BURST', 10)
+    backend = config.get('WEATHER_QUOTA_BACKEND', 'local')
+    if backend == 'local':
+        store = LocalTokenStore(rate, capacity)
+    elif backend == 'sqlite':
+        path = config.get('WEATHER_QUOTA_PATH') or config.get('WEATHER_CACHE_PATH', 'weather_cache.db')
+        store = SQLiteTokenStore(os.path.join(root_path, path), rate, capacity)
+    else:
+        raise ValueError(f"Unsupported quota backend: {backend}")
+    return UpstreamScheduler(store)
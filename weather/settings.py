@@ -0,0 +1,84 @@
+"""
+Configuration profiles for create_app()
+"""
+import os
+
+
+class BaseConfig:
+    SQLALCHEMY_DATABASE_URI = 'sqlite:///weather.db'
+    SQLALCHEMY_TRACK_MODIFICATIONS = False
+    SECRET_KEY = os.getenv('SECRET_KEY', 'thisisasecret')
+
+    # 'memory' is per process; 'sqlite' is shared by every gunicorn worker
+    WEATHER_CACHE_BACKEND = os.getenv('WEATHER_CACHE_BACKEND', 'memory')
+    WEATHER_CACHE_PATH = os.getenv('WEATHER_CACHE_PATH', 'weather_cache.db')
+    WEATHER_CACHE_TTL = int(os.getenv('WEATHER_CACHE_TTL', '600'))
+    # How long a stale observation keeps being served at boot while it is refreshed
+    WEATHER_STALE_GRACE = int(os.getenv('WEATHER_STALE_GRACE', '120'))
+    # Raw upstream responses, one compressed file per city, read when the cache misses
+    WEATHER_RESPONSE_DIR = os.getenv('WEATHER_RESPONSE_DIR', 'response_cache')
+    # Admin-only endpoints are disabled unless a token is configured
+    WEATHER_ADMIN_TOKEN = os.getenv('WEATHER_ADMIN_TOKEN')
+    WEATHER_PROFILE_SAMPLE_EVERY = int(os.getenv('WEATHER_PROFILE_SAMPLE_EVERY', '0'))
+    # Tracing is off unless a span file is given, e.g. traces/spans.jsonl
+    WEATHER_TRACE_FILE = os.getenv('WEATHER_TRACE_FILE')
+    WEATHER_LOG_LEVEL = os.getenv('WEATHER_LOG_LEVEL', 'INFO')
+    # Full upstream payloads are logged at DEBUG for one in every N fetches
+    WEATHER_PAYLOAD_LOG_SAMPLE_EVERY = int(os.getenv('WEATHER_PAYLOAD_LOG_SAMPLE_EVERY', '100'))
+    # Upstream API key quota; 'sqlite' shares the bucket across workers via WEATHER_CACHE_PATH
+    WEATHER_QUOTA_PER_MINUTE = int(os.getenv('WEATHER_QUOTA_PER_MINUTE', '60'))
+    WEATHER_QUOTA_BURST = int(os.getenv('WEATHER_QUOTA_BURST', '10'))
+    WEATHER_QUOTA_BACKEND = os.getenv('WEATHER_QUOTA_BACKEND', 'local')
+    # Total time one request may queue for tokens across all its upstream calls; keep it
+    # below gunicorn's 30s worker timeout
+    WEATHER_QUOTA_MAX_WAIT = float(os.getenv('WEATHER_QUOTA_MAX_WAIT', '10'))
+    # Per-call timeout for upstream HTTP requests, so a hung call cannot hold a pool thread
+    WEATHER_UPSTREAM_TIMEOUT = float(os.getenv('WEATHER_UPSTREAM_TIMEOUT', '10'))
+    # Names the upstream reported as unknown are rejected without a call for this long
+    WEATHER_NEGATIVE_CACHE_SIZE = int(os.getenv('WEATHER_NEGATIVE_CACHE_SIZE', '1024'))
+    WEATHER_NEGATIVE_CACHE_TTL = int(os.getenv('WEATHER_NEGATIVE_CACHE_TTL', '300'))
+    # 'live', 'record' (append upstream traffic to WEATHER_CASSETTE) or 'replay' (serve it)
+    WEATHER_UPSTREAM_MODE = os.getenv('WEATHER_UPSTREAM_MODE', 'live')
+    WEATHER_CASSETTE = os.getenv('WEATHER_CASSETTE', 'cassettes/upstream.jsonl')
+    # 'recorded', 'none' or a fixed number of seconds per replayed call
+    WEATHER_REPLAY_LATENCY = os.getenv('WEATHER_REPLAY_LATENCY', 'recorded')
+
+
+class DevelopmentConfig(BaseConfig):
+    DEBUG = True
+
+
+class ProductionConfig(BaseConfig):
+    DEBUG = False
+    # One cache and one quota bucket for every gunicorn worker unless overridden
+    WEATHER_CACHE_BACKEND = os.getenv('WEATHER_CACHE_BACKEND', 'sqlite')
+    WEATHER_QUOTA_BACKEND = os.getenv('WEATHER_QUOTA_BACKEND', 'sqlite')
+
+
+class TestingConfig(BaseConfig):
+    TESTING = True
+    DEBUG = False
+    SQLALCHEMY_DATABASE_URI = 'sqlite://'
+    WEATHER_CACHE_BACKEND = 'memory'
+    WEATHER_QUOTA_BACKEND = 'local'
+    WEATHER_TRACE_FILE = None
+    WEATHER_LOG_LEVEL = 'WARNING'
+
+
+PROFILES = {
+    'development': DevelopmentConfig,
+    'production': ProductionConfig,
+    'testing': TestingConfig,
+}
+
+
+def resolve_config(config=None):
+    """Map a profile name, a config object or None (WEATHER_ENV) to a config object"""
+    if config is None:
+        config = os.getenv('WEATHER_ENV', 'development')
+    if isinstance(config, str):
+        try:
+            return PROFILES[config]
+        except KeyError:
+            raise ValueError(f"Unknown config profile: {config}")
+    return config
@@ -0,0 +1,59 @@
+"""
+On-disk store of raw upstream responses that survives restarts
+"""
+import gzip
+import hashlib
+import json
+import os
+import tempfile
+import time
+
+
+class ResponseStore:
+    """One gzip-compressed JSON file per cache key, replaced atomically on write"""
+
+    def __init__(self, directory):
+        self.directory = directory
+
+    def _path(self, key):
+        digest = hashlib.sha1(key.encode('utf-8')).hexdigest()
+        return os.path.join(self.directory, f'{digest}.json.gz')
+
+    def load(self, key):
+        """Return (payload, fetched_at) for key, or None if nothing was stored"""
+        try:
+            with gzip.open(self._path(key), 'rt', encoding='UTF-8') as f:
+                record = json.load(f)
+        except (OSError, ValueError):
+            # Missing, truncated or corrupt files are treated as a miss
+            return None
+        if record.get('key') != key:
+            return None
+        return record['payload'], record['fetched_at']
+
+    def save(self, key, payload, fetched_at=None):
+        """Write payload for key, replacing any previous file in one rename"""
+        record = {
+            'key': key,
+            'fetched_at': time.time() if fetched_at is None else fetched_at,
+            'payload': payload,
+        }
+        os.makedirs(self.directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as raw:
+                with gzip.GzipFile(fileobj=raw, mode='wb') as f:
+                    f.write(json.dumps(record).encode('utf-8'))
+                raw.flush()
+                os.fsync(raw.fileno())
+            os.replace(tmp_path, self._path(key))
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    def delete(self, key):
+        """Remove the stored response for key"""
+        try:
+            os.unlink(self._path(key))
+        except FileNotFoundError:
+            pass
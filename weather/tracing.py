@@ -0,0 +1,188 @@
+"""
+Lightweight in-process tracing with spans exported as JSON lines
+
+Spans are handed to a QueueHandler and written by a QueueListener thread to a
+RotatingFileHandler, so request threads never wait on file I/O.
+"""
+import contextvars
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import threading
+import time
+from contextlib import contextmanager
+
+from flask import before_render_template, g, request, template_rendered
+
+_current_span = contextvars.ContextVar('current_span', default=None)
+
+
+class Span:
+    """One timed operation; parent and trace ids are taken from the enclosing span"""
+
+    def __init__(self, tracer, name, attributes):
+        parent = _current_span.get()
+        self.tracer = tracer
+        self.name = name
+        self.attributes = attributes
+        self.span_id = os.urandom(8).hex()
+        self.parent_id = parent.span_id if parent else None
+        self.trace_id = parent.trace_id if parent else os.urandom(16).hex()
+        self.start = time.time()
+        self._started = time.perf_counter()
+        self._token = _current_span.set(self)
+
+    def set_attribute(self, key, value):
+        self.attributes[key] = value
+
+    def end(self):
+        duration = time.perf_counter() - self._started
+        try:
+            _current_span.reset(self._token)
+        except ValueError:
+            # Ended from a different context than it was started in
+            _current_span.set(None)
+        self.tracer.export({
+            'trace_id': self.trace_id,
+            'span_id': self.span_id,
+            'parent_id': self.parent_id,
+            'name': self.name,
+            'start': self.start,
+            'duration_ms': round(duration * 1000, 3),
+            'thread': threading.current_thread().name,
+            'attributes': self.attributes,
+        })
+
+
+class _NullSpan:
+    def set_attribute(self, key, value):
+        pass
+
+    def end(self):
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class Tracer:
+    """Creates spans and exports finished ones asynchronously"""
+
+    def __init__(self):
+        self.enabled = False
+        self._logger = None
+        self._listener = None
+
+    def configure(self, path, max_bytes=10 * 1024 * 1024, backup_count=5):
+        """Start exporting spans to a rotating JSONL file"""
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        file_handler = logging.handlers.RotatingFileHandler(
+            path, maxBytes=max_bytes, backupCount=backup_count, encoding='UTF-8')
+        file_handler.setFormatter(logging.Formatter('%(message)s'))
+
+        span_queue = queue.SimpleQueue()
+        self._logger = logging.getLogger('weather.trace')
+        self._logger.propagate = False
+        self._logger.setLevel(logging.INFO)
+        self._logger.handlers[:] = [logging.handlers.QueueHandler(span_queue)]
+        self._listener = logging.handlers.QueueListener(span_queue, file_handler)
+        self._listener.start()
+        self.enabled = True
+        os.register_at_fork(after_in_child=self._restart_listener)
+
+    def _restart_listener(self):
+        """Replace the writer thread lost when a preloaded master forks a worker"""
+        if self._listener is not None:
+            self._listener = logging.handlers.QueueListener(self._listener.queue,
+                                                            *self._listener.handlers)
+            self._listener.start()
+
+    def shutdown(self):
+        """Flush pending spans and stop the writer thread"""
+        self.enabled = False
+        if self._listener is not None:
+            self._listener.stop()
+            self._listener = None
+
+    def start_span(self, name, **attributes):
+        if not self.enabled:
+            return _NULL_SPAN
+        return Span(self, name, attributes)
+
+    @contextmanager
+    def span(self, name, **attributes):
+        span = self.start_span(name, **attributes)
+        try:
+            yield span
+        except Exception as e:
+            span.set_attribute('error', repr(e))
+            raise
+        finally:
+            span.end()
+
+    def export(self, record):
+        self._logger.info(json.dumps(record, default=str))
+
+
+tracer = Tracer()
+
+
+def init_tracing(app, db):
+    """Trace requests, SQLAlchemy queries and template rendering when WEATHER_TRACE_FILE is set"""
+    path = app.config.get('WEATHER_TRACE_FILE')
+    if not path:
+        return
+    tracer.configure(os.path.join(app.root_path, path),
+                     max_bytes=app.config.get('WEATHER_TRACE_MAX_BYTES', 10 * 1024 * 1024),
+                     backup_count=app.config.get('WEATHER_TRACE_BACKUPS', 5))
+
+    @app.before_request
+    def start_request_span():
+        g.trace_span = tracer.start_span('request', method=request.method, path=request.path,
+                                         endpoint=request.endpoint)
+
+    @app.teardown_request
+    def end_request_span(error=None):
+        span = g.pop('trace_span', None)
+        if span is not None:
+            if error is not None:
+                span.set_attribute('error', repr(error))
+            span.end()
+
+    @app.after_request
+    def record_status(response):
+        span = g.get('trace_span')
+        if span is not None:
+            span.set_attribute('status', response.status_code)
+        return response
+
+    def start_render_span(sender, template, context, **extra):
+        g.setdefault('render_spans', []).append(tracer.start_span('render_template',
+                                                                  template=template.name))
+
+    def end_render_span(sender, template, context, **extra):
+        spans = g.get('render_spans')
+        if spans:
+            spans.pop().end()
+
+    before_render_template.connect(start_render_span, app, weak=False)
+    template_rendered.connect(end_render_span, app, weak=False)
+
+    from sqlalchemy import event
+
+    def start_query_span(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault('trace_spans', []).append(
+            tracer.start_span('sql', statement=statement[:200]))
+
+    def end_query_span(conn, cursor, statement, parameters, context, executemany):
+        spans = conn.info.get('trace_spans')
+        if spans:
+            spans.pop().end()
+
+    with app.app_context():
+        event.listen(db.engine, 'before_cursor_execute', start_query_span)
+        event.listen(db.engine, 'after_cursor_execute', end_query_span)
@@ -0,0 +1,37 @@
+"""
+Unit systems: upstream data is kept in SI (Kelvin) and converted on output
+"""
+UNIT_SYSTEMS = {
+    'metric': {'name': 'Celsius', 'symbol': '° C'},
+    'imperial': {'name': 'Fahrenheit', 'symbol': '° F'},
+    'standard': {'name': 'Kelvin', 'symbol': ' K'},
+}
+DEFAULT_UNITS = 'metric'
+UNITS_COOKIE = 'units'
+UNITS_COOKIE_MAX_AGE = 365 * 24 * 3600
+
+
+def convert_temperature(kelvin, units):
+    """Convert a Kelvin temperature to the given unit system"""
+    if units == 'imperial':
+        value = (kelvin - 273.15) * 9 / 5 + 32
+    elif units == 'metric':
+        value = kelvin - 273.15
+    else:
+        value = kelvin
+    return round(value, 2)
+
+
+def resolve_units(request):
+    """Pick the unit system from the ?units= param, then the cookie, then the default"""
+    for candidate in (request.args.get('units'), request.cookies.get(UNITS_COOKIE)):
+        if candidate in UNIT_SYSTEMS:
+            return candidate
+    return DEFAULT_UNITS
+
+
+def remember_units(request, response, units):
+    """Persist an explicitly requested unit system as the user's preference"""
+    if request.args.get('units') == units and request.cookies.get(UNITS_COOKIE) != units:
+        response.set_cookie(UNITS_COOKIE, units, max_age=UNITS_COOKIE_MAX_AGE, samesite='Lax')
+    return response
@@ -0,0 +1,61 @@
+"""
+Warm start: preload persisted observations and refresh stale ones in the background
+"""
+import logging
+import threading
+import time
+
+from weather.cache import cache_key
+
+logger = logging.getLogger(__name__)
+
+# Cache row held by the process running the refresh sweep
+WARMUP_CLAIM_KEY = 'warmup:sweep'
+
+
+def _refresh_all(cities, refresh):
+    for city in cities:
+        try:
+            refresh(city)
+        except Exception:
+            logger.exception('warmup refresh failed', extra={'city': city})
+
+
+def start_warmup(cities, cache, refresh, grace_ttl, store=None, ttl=None):
+    """Keep persisted observations servable and refresh the stale ones in a daemon thread
+
+    Observations come from the cache itself or, failing that, from the on-disk response
+    store. Expired entries are re-armed for grace_ttl seconds so the first request after
+    a restart is served from cache while refresh(city) fetches a current observation.
+
+    Only one process per grace_ttl window runs the refresh sweep: with a shared cache the
+    other workers find the claim taken and rely on its results. Returns the refresh
+    thread, or None if another process holds the sweep.
+    """
+    now = time.time()
+    stale = []
+    for city in cities:
+        key = cache_key('weather', city)
+        entry = cache.peek(key)
+        if entry is None and store is not None:
+            stored = store.load(key)
+            if stored is not None:
+                value, fetched_at = stored
+                entry = (value, fetched_at + ttl)
+                if entry[1] >= now:
+                    cache.set(key, value, entry[1] - now)
+        if entry is None:
+            stale.append(city)
+            continue
+        value, expires_at = entry
+        if expires_at < now:
+            cache.set(key, value, grace_ttl)
+            stale.append(city)
+
+    if not stale or not cache.claim(WARMUP_CLAIM_KEY, grace_ttl):
+        return None
+
+    thread = threading.Thread(target=_refresh_all, args=(stale, refresh),
+                              name='weather-warmup', daemon=True)
+    thread.start()
+    return thread